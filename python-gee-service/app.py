@@ -2,10 +2,12 @@
 Flask Application for Google Earth Engine Service
 Exposes REST API endpoints for RUSLE computation
 """
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
+import json
 import logging
 import ee
+import numpy as np
 from config import Config
 from gee_service import gee_service
 from rusle_config import build_config
@@ -38,6 +40,38 @@ def resolve_calculators(config_overrides=None):
         return RUSLECalculator(config), RainfallCalculator(config), config
     return DEFAULT_RUSLE_CALCULATOR, DEFAULT_RAINFALL_CALCULATOR, DEFAULT_RUSLE_CONFIG
 
+# Binary grid record: x, y (int32) + min_lon, min_lat, max_lon, max_lat, erosion_rate (float32)
+GRID_CELL_DTYPE = np.dtype([
+    ('x', '<i4'),
+    ('y', '<i4'),
+    ('min_lon', '<f4'),
+    ('min_lat', '<f4'),
+    ('max_lon', '<f4'),
+    ('max_lat', '<f4'),
+    ('erosion_rate', '<f4'),
+])
+
+
+def pack_grid_cells(cells):
+    """
+    Pack detailed-grid cells into fixed-width little-endian records.
+    Each record is GRID_CELL_DTYPE.itemsize bytes and can be read client-side
+    with a DataView; the polygon ring is implied by the cell bounds.
+    """
+    records = np.array([
+        (
+            cell['x'],
+            cell['y'],
+            cell['geometry']['coordinates'][0][0][0],
+            cell['geometry']['coordinates'][0][0][1],
+            cell['geometry']['coordinates'][0][2][0],
+            cell['geometry']['coordinates'][0][2][1],
+            cell['erosion_rate']
+        )
+        for cell in cells
+    ], dtype=GRID_CELL_DTYPE)
+    return records.tobytes()
+
 # Create Flask app
 app = Flask(__name__)
 CORS(app)  # Enable CORS for PHP requests
@@ -453,6 +487,8 @@ def compute_detailed_grid():
     Compute detailed erosion grid for visualization
     Input: {area_geometry: GeoJSON, year: int, grid_size: int}
     Output: {cells: [...], statistics: {...}, success: bool}
+    With ?format=bin the cells are returned as packed GRID_CELL_DTYPE records
+    and grid metadata is sent in X-Grid-* headers.
     """
     try:
         data = request.get_json()
@@ -500,6 +536,16 @@ def compute_detailed_grid():
             geojson=area_geometry  # Pass original GeoJSON for complexity analysis
         )
         
+        # Compact binary payload for internal consumers (GeoJSON stays the default)
+        if request.args.get('format') == 'bin':
+            response = Response(pack_grid_cells(result['cells']), mimetype='application/octet-stream')
+            response.headers['X-Grid-Size'] = str(result['grid_size'])
+            response.headers['X-Cell-Count'] = str(result['cell_count'])
+            response.headers['X-Record-Size'] = str(GRID_CELL_DTYPE.itemsize)
+            response.headers['X-Grid-Bbox'] = json.dumps(result['bbox'])
+            response.headers['X-Grid-Statistics'] = json.dumps(result['statistics'])
+            return response, 200
+        
         response_payload = {
             'success': True,
             'data': result
@@ -22,6 +22,8 @@ class Config:
     GEE_SERVICE_ACCOUNT_EMAIL = os.getenv('GEE_SERVICE_ACCOUNT_EMAIL')
     GEE_PRIVATE_KEY_PATH = os.getenv('GEE_PRIVATE_KEY_PATH')
     GEE_PROJECT_ID = os.getenv('GEE_PROJECT_ID')
+    # High-volume endpoint suits the service's parallel, automated getInfo traffic
+    GEE_API_URL = os.getenv('GEE_API_URL', 'https://earthengine-highvolume.googleapis.com')
     
     # RUSLE configuration
     RUSLE_START_YEAR = 1993
@@ -42,7 +44,12 @@ class Config:
     REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
     REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
     REDIS_DB = int(os.getenv('REDIS_DB', 2))
-    
+
+    # Result cache (DB 2 and 3 are used by the Celery broker/backend)
+    RESULT_CACHE_ENABLED = os.getenv('RESULT_CACHE_ENABLED', 'true').lower() != 'false'
+    RESULT_CACHE_DB = int(os.getenv('RESULT_CACHE_DB', REDIS_DB + 2))
+    RESULT_CACHE_TTL = int(os.getenv('RESULT_CACHE_TTL', 86400 * 7))  # 7 days
+
     # Storage paths
     STORAGE_PATH = os.getenv('STORAGE_PATH', '/var/www/soil-erosion/storage/rusle-tiles')
     
@@ -61,6 +68,9 @@ class Config:
     # Timeout settings (in seconds)
     GEE_API_TIMEOUT = int(os.getenv('GEE_API_TIMEOUT', 600))  # 10 minutes default for GEE operations (matches Laravel timeout)
     
+    # Reducer tile decomposition; higher values trade speed for memory headroom
+    GEE_TILE_SCALE = int(os.getenv('GEE_TILE_SCALE', 4))
+    
     @classmethod
     def validate(cls):
         """Validate required configuration"""
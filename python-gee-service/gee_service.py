@@ -4,53 +4,21 @@ Handles EE initialization, authentication, and core operations
 """
 import ee
 import logging
-import threading
+import numpy as np
+from itertools import chain
 from pathlib import Path
 
 from config import Config
 
 logger = logging.getLogger(__name__)
 
-class TimeoutError(Exception):
-    """Timeout exception for GEE operations"""
-    pass
-
-def timeout_wrapper(func, timeout_seconds=None):
-    """
-    Wrapper to timeout long-running GEE API calls
-    """
-    if timeout_seconds is None:
-        timeout_seconds = Config.GEE_API_TIMEOUT
-    
-    result = [None]
-    exception = [None]
-    
-    def target():
-        try:
-            result[0] = func()
-        except Exception as e:
-            exception[0] = e
-    
-    thread = threading.Thread(target=target)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout_seconds)
-    
-    if thread.is_alive():
-        logger.error(f"Operation timed out after {timeout_seconds} seconds")
-        raise TimeoutError(f"Operation timed out after {timeout_seconds} seconds")
-    
-    if exception[0]:
-        raise exception[0]
-    
-    return result[0]
-
 class GEEService:
     """Google Earth Engine Service"""
     
     def __init__(self):
         self.initialized = False
         self.project_id = None
+        self._stats_reducer = None
         
     def initialize(self):
         """Initialize Earth Engine with service account credentials"""
@@ -76,10 +44,15 @@ class GEEService:
             logger.info("Step 3: Initializing Earth Engine client library...")
             ee.Initialize(
                 credentials=credentials,
-                project=Config.GEE_PROJECT_ID
+                project=Config.GEE_PROJECT_ID,
+                opt_url=Config.GEE_API_URL
             )
             logger.info("  ✓ Earth Engine client library initialized")
             
+            # Let the EE client enforce the request timeout on its own HTTP calls
+            ee.data.setDeadline(Config.GEE_API_TIMEOUT * 1000)
+            logger.info(f"  ✓ Request deadline set to {Config.GEE_API_TIMEOUT}s")
+            
             # Test that EE actually works by performing a simple operation
             logger.info("Step 4: Testing Earth Engine with sample operation...")
             test_image = ee.Image('USGS/SRTMGL1_003')
@@ -173,41 +146,76 @@ class GEEService:
             logger.error(f"Failed to calculate bounding box: {str(e)}")
             raise
     
-    def compute_statistics(self, image, geometry, scale=1000, timeout_seconds=None):
-        """Compute statistics for an image over a geometry"""
+    # Nesting depth of the position arrays for each GeoJSON geometry type
+    _GEOJSON_DEPTH = {
+        'Point': 0,
+        'MultiPoint': 1,
+        'LineString': 1,
+        'MultiLineString': 2,
+        'Polygon': 2,
+        'MultiPolygon': 3
+    }
+    
+    def bbox_from_geojson(self, geojson):
+        """
+        Calculate bounding box from GeoJSON coordinates on the client (no EE call)
+        Returns None for unsupported or empty geometries
+        """
+        try:
+            depth = self._GEOJSON_DEPTH.get(geojson.get('type'))
+            if depth is None:
+                return None
+            positions = geojson.get('coordinates') or []
+            positions = [positions] if depth == 0 else positions
+            for _ in range(depth - 1):
+                positions = chain.from_iterable(positions)
+            coords = np.array([position[:2] for position in positions], dtype=np.float64)
+            if coords.size == 0:
+                return None
+            min_lon, min_lat = coords.min(axis=0).tolist()
+            max_lon, max_lat = coords.max(axis=0).tolist()
+        except Exception as e:
+            logger.warning(f"Failed to derive bbox from GeoJSON: {str(e)}")
+            return None
+        
+        return {
+            'min_lon': min_lon,
+            'min_lat': min_lat,
+            'max_lon': max_lon,
+            'max_lat': max_lat
+        }
+    
+    def compute_statistics(self, image, geometry, scale=1000, tile_scale=None):
+        """
+        Compute statistics for an image over a geometry
+        Bounded by the EE request deadline set in initialize()
+        tile_scale defaults to Config.GEE_TILE_SCALE
+        """
         try:
-            # Use config timeout if not specified
-            if timeout_seconds is None:
-                timeout_seconds = Config.GEE_API_TIMEOUT
-            
-            # Build the reduceRegion operation
-            reducer = ee.Reducer.mean().combine(
-                reducer2=ee.Reducer.min(), sharedInputs=True
-            ).combine(
-                reducer2=ee.Reducer.max(), sharedInputs=True
-            ).combine(
-                reducer2=ee.Reducer.stdDev(), sharedInputs=True
-            )
-            
             reduced = image.reduceRegion(
-                reducer=reducer,
+                reducer=self._statistics_reducer(),
                 geometry=geometry,
                 scale=scale,
                 maxPixels=1e9,
-                bestEffort=True
+                bestEffort=True,
+                tileScale=tile_scale or Config.GEE_TILE_SCALE
             )
             
-            # Wrap getInfo() call with timeout
-            def get_stats():
-                return reduced.getInfo()
-            
-            stats = timeout_wrapper(get_stats, timeout_seconds=timeout_seconds)
-            
-            return stats
+            return reduced.getInfo()
         except Exception as e:
             logger.error(f"Failed to compute statistics: {str(e)}")
             raise
     
+    def _statistics_reducer(self):
+        """Combined mean/min/max/stdDev reducer, built once on first use"""
+        if self._stats_reducer is None:
+            self._stats_reducer = ee.Reducer.mean().combine(
+                reducer2=ee.Reducer.minMax(), sharedInputs=True
+            ).combine(
+                reducer2=ee.Reducer.stdDev(), sharedInputs=True
+            )
+        return self._stats_reducer
+    
     def calculate_area_km2(self, geometry):
         """Calculate area in square kilometers"""
         try:
@@ -324,7 +332,8 @@ class GEEService:
             sampled = image.reduceRegions(
                 collection=sample_collection,
                 reducer=ee.Reducer.first(),
-                scale=scale
+                scale=scale,
+                tileScale=Config.GEE_TILE_SCALE
             ).getInfo()
             
             # Extract values and assign to cells
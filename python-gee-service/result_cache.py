@@ -0,0 +1,88 @@
+"""
+Result cache for expensive GEE computations
+Stores JSON-serialisable results in Redis keyed by a hash of the request inputs
+"""
+import hashlib
+import json
+import logging
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def geometry_fingerprint(geojson):
+    """
+    Return a stable hash for a GeoJSON geometry.
+    Uses the shapely WKB encoding as the canonical form and falls back to the
+    sorted JSON text when shapely is unavailable or the geometry is invalid.
+    """
+    try:
+        from shapely.geometry import shape
+        payload = shape(geojson).wkb
+    except Exception:
+        payload = json.dumps(geojson, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """Redis-backed cache for computation results"""
+
+    def __init__(self, prefix='rusle-cache'):
+        self.prefix = prefix
+        self._client = None
+        self._disabled = not Config.RESULT_CACHE_ENABLED
+
+    def _get_client(self):
+        """Lazily connect to Redis; disable the cache if Redis is unreachable"""
+        if self._disabled:
+            return None
+        if self._client is None:
+            try:
+                import redis
+                self._client = redis.Redis(
+                    host=Config.REDIS_HOST,
+                    port=Config.REDIS_PORT,
+                    db=Config.RESULT_CACHE_DB,
+                    socket_timeout=2,
+                    socket_connect_timeout=2
+                )
+                self._client.ping()
+            except Exception as e:
+                logger.warning(f"Result cache disabled (Redis unavailable): {str(e)}")
+                self._client = None
+                self._disabled = True
+        return self._client
+
+    def make_key(self, namespace, *parts):
+        """Build a cache key from a namespace and arbitrary hashable parts"""
+        raw = ':'.join(str(part) for part in parts)
+        digest = hashlib.blake2b(raw.encode(), digest_size=20).hexdigest()
+        return f"{self.prefix}:{namespace}:{digest}"
+
+    def get(self, key):
+        """Return the cached value for key, or None on miss/error"""
+        client = self._get_client()
+        if client is None:
+            return None
+        try:
+            blob = client.get(key)
+            return json.loads(blob) if blob else None
+        except Exception as e:
+            logger.warning(f"Result cache read failed: {str(e)}")
+            return None
+
+    def set(self, key, value, ttl=None):
+        """Store value under key with a TTL (defaults to Config.RESULT_CACHE_TTL)"""
+        client = self._get_client()
+        if client is None:
+            return False
+        try:
+            client.setex(key, ttl or Config.RESULT_CACHE_TTL, json.dumps(value))
+            return True
+        except Exception as e:
+            logger.warning(f"Result cache write failed: {str(e)}")
+            return False
+
+# Global result cache instance
+result_cache = ResultCache()
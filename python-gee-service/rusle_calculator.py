@@ -2,48 +2,70 @@
 RUSLE (Revised Universal Soil Loss Equation) Calculator
 Implements all RUSLE factors and erosion computation for Tajikistan
 """
+import csv
 import ee
+import functools
+import hashlib
+import json
 import logging
 import math
 import numpy as np
+import requests
 import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, List, Mapping, Optional, Sequence
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
 
+from config import Config
 from gee_service import gee_service
-from rusle_config import RUSLEConfig, build_config
+from result_cache import geometry_fingerprint, result_cache
+from rusle_config import (
+    KFactorParams,
+    LSFactorParams,
+    RFactorParams,
+    RUSLEConfig,
+    build_config,
+    prepare_p_factor_segments,
+)
+from rusle_numba import classify_erosion
 
 logger = logging.getLogger(__name__)
 
-class TimeoutError(Exception):
-    pass
+def _log_errors(name, exc_info=False):
+    """
+    Log failures of a compute method as "Failed to compute <name>" and re-raise
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                logger.error(f"Failed to compute {name}: {str(e)}", exc_info=exc_info)
+                raise
+        return wrapper
+    return decorator
+
+def _safe_round(value, decimals=2):
+    """Round a numeric getInfo value; None and non-numbers become 0.0"""
+    return round(value, decimals) if isinstance(value, (int, float)) else 0.0
 
-def timeout_wrapper(func, timeout_seconds=600):
+def morton_order(xs, ys):
     """
-    Wrapper to timeout long-running GEE API calls
+    Return the permutation that sorts (x, y) grid indices along a Z-order
+    (Morton) curve, so spatially adjacent cells end up next to each other.
     """
-    result = [None]
-    exception = [None]
-    
-    def target():
-        try:
-            result[0] = func()
-        except Exception as e:
-            exception[0] = e
-    
-    thread = threading.Thread(target=target)
-    thread.daemon = True
-    thread.start()
-    thread.join(timeout_seconds)
+    def spread_bits(values):
+        values = np.asarray(values, dtype=np.uint64) & np.uint64(0xFFFFFFFF)
+        values = (values | (values << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+        values = (values | (values << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+        values = (values | (values << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+        values = (values | (values << np.uint64(2))) & np.uint64(0x3333333333333333)
+        values = (values | (values << np.uint64(1))) & np.uint64(0x5555555555555555)
+        return values
     
-    if thread.is_alive():
-        logger.error(f"Operation timed out after {timeout_seconds} seconds")
-        raise TimeoutError(f"Operation timed out after {timeout_seconds} seconds")
-    
-    if exception[0]:
-        raise exception[0]
-    
-    return result[0]
+    codes = spread_bits(xs) | (spread_bits(ys) << np.uint64(1))
+    return np.argsort(codes, kind='stable')
 
 class RUSLECalculator:
     """RUSLE Calculator for soil erosion estimation"""
@@ -51,6 +73,14 @@ class RUSLECalculator:
     LONG_TERM_R_START_YEAR = 1994
     LONG_TERM_R_END_YEAR = 2024  # Exclusive upper bound for filterDate
     FLOW_ACC_GRID_SIZE = 1000  # meters, matches HydroSHEDS 30 arc-second (~927m) res resampled to 1000m (1km) resolution
+    CSV_SAMPLE_THRESHOLD = 1000  # grids sampling more points than this download CSV
+    GRAPH_CACHE_SIZE = 32  # max memoized EE images per cache
+    RAINFALL_YEAR_BATCH = 5  # years reduced per rainfall statistics request
+    RAINFALL_MAX_WORKERS = 6  # concurrent rainfall statistics requests
+    METERS_PER_DEGREE = 111320.0  # length of one degree of latitude (approx.)
+    MAX_REDUCE_PIXELS = 1024  # reduceResolution input pixels per output pixel
+    GRID_CACHE_VERSION = 2  # bump when detailed-grid semantics change (v2: cell-grid reduceRegions)
+    YEARLY_RAINFALL_DTYPE = np.dtype([('year', 'i4'), ('mean_precip', 'f8')])
     
     def __init__(self, config: Optional[Mapping[str, Any]] = None):
         if isinstance(config, RUSLEConfig):
@@ -58,70 +88,83 @@ class RUSLECalculator:
         else:
             self.config = build_config(config)
         self._initialize_parameters()
+        
+        # Memoized EE graphs keyed by geometry hash (see _cached)
+        self._cache_lock = threading.Lock()
+        self._lc_cache = OrderedDict()
+        self._k_cache = OrderedDict()
+        self._ls_cache = OrderedDict()
+        self._soil_loss_cache = OrderedDict()
+        self._slope_cache = OrderedDict()
+        self._r_cache = OrderedDict()
 
     def _initialize_parameters(self) -> None:
         # R-factor parameters
-        self.r_factor_params = {
-            "coefficient": float(self.config.get("r_factor.coefficient", 0.562)),
-            "intercept": float(self.config.get("r_factor.intercept", -8.12)),
-            "long_term_start_year": int(
+        self.r_factor_params = RFactorParams(
+            coefficient=float(self.config.get("r_factor.coefficient", 0.562)),
+            intercept=float(self.config.get("r_factor.intercept", -8.12)),
+            long_term_start_year=int(
                 self.config.get("r_factor.long_term_start_year", self.LONG_TERM_R_START_YEAR)
             ),
-            "long_term_end_year": int(
+            long_term_end_year=int(
                 self.config.get("r_factor.long_term_end_year", self.LONG_TERM_R_END_YEAR)
             ),
-            "use_long_term_default": bool(
+            use_long_term_default=bool(
                 self.config.get("r_factor.use_long_term_default", True)
             ),
-        }
+        )
 
         # K-factor parameters
-        self.k_factor_params = {
-            "sand_fraction_multiplier": float(
+        self.k_factor_params = KFactorParams(
+            sand_fraction_multiplier=float(
                 self.config.get("k_factor.sand_fraction_multiplier", 0.2)
             ),
-            "soc_to_organic_multiplier": float(
+            soc_to_organic_multiplier=float(
                 self.config.get("k_factor.soc_to_organic_multiplier", 0.01724)
             ),
-            "base_constant": float(self.config.get("k_factor.base_constant", 27.66)),
-            "m_exponent": float(self.config.get("k_factor.m_exponent", 1.14)),
-            "area_factor": float(self.config.get("k_factor.area_factor", 1e-8)),
-            "organic_matter_subtract": float(
+            base_constant=float(self.config.get("k_factor.base_constant", 27.66)),
+            m_exponent=float(self.config.get("k_factor.m_exponent", 1.14)),
+            area_factor=float(self.config.get("k_factor.area_factor", 1e-8)),
+            organic_matter_subtract=float(
                 self.config.get("k_factor.organic_matter_subtract", 12.0)
             ),
-            "structure_coefficient": float(
+            structure_coefficient=float(
                 self.config.get("k_factor.structure_coefficient", 0.0043)
             ),
-            "structure_baseline": float(
+            structure_baseline=float(
                 self.config.get("k_factor.structure_baseline", 2.0)
             ),
-            "permeability_coefficient": float(
+            permeability_coefficient=float(
                 self.config.get("k_factor.permeability_coefficient", 0.0033)
             ),
-            "permeability_baseline": float(
+            permeability_baseline=float(
                 self.config.get("k_factor.permeability_baseline", 3.0)
             ),
-        }
+        )
 
         # LS-factor parameters
         self.flow_acc_grid_size = int(
             self.config.get("ls_factor.grid_size", self.FLOW_ACC_GRID_SIZE)
         )
-        self.ls_factor_params = {
-            "flow_length_reference": float(
+        self.ls_factor_params = LSFactorParams(
+            flow_length_reference=float(
                 self.config.get("ls_factor.flow_length_reference", 22.13)
             ),
-            "flow_exponent": float(self.config.get("ls_factor.flow_exponent", 0.4)),
-            "slope_normalisation": float(
+            flow_exponent=float(self.config.get("ls_factor.flow_exponent", 0.4)),
+            slope_normalisation=float(
                 self.config.get("ls_factor.slope_normalisation", 0.0896)
             ),
-            "slope_exponent": float(
+            slope_exponent=float(
                 self.config.get("ls_factor.slope_exponent", 1.3)
             ),
-            "minimum_slope_radians": float(
+            minimum_slope_radians=float(
                 self.config.get("ls_factor.minimum_slope_radians", 0.0001)
             ),
-        }
+        )
+
+        # K and LS formulas as single EE expressions with the constants inlined
+        self.k_factor_expression = self._build_k_factor_expression(self.k_factor_params)
+        self.ls_factor_expression = self._build_ls_factor_expression(self.ls_factor_params)
 
         # C-factor lookup
         class_map = self.config.get("c_factor.class_map", {})
@@ -156,15 +199,31 @@ class RUSLECalculator:
         self.c_factor_classes: List[int] = [item[0] for item in sorted_classes]
         self.c_factor_values: List[float] = [item[1] for item in sorted_classes]
         self.c_factor_default = float(self.config.get("c_factor.default_value", 0.0))
+        # ee.List versions are created on first use (EE is not initialized yet)
+        self._c_remap_lists: Optional[Tuple[Any, Any]] = None
 
         # P-factor parameters
         self.p_factor_default = float(self.config.get("p_factor.default_value", 1.0))
         self.p_factor_cropland_class = int(
             self.config.get("p_factor.cropland_class", 12)
         )
-        self.p_factor_segments = self._prepare_p_factor_segments(
+        self.p_factor_segments = prepare_p_factor_segments(
             self.config.get("p_factor.breakpoints", [])
         )
+        (
+            self.p_slope_class_expression,
+            self.p_slope_class_values,
+        ) = self._build_p_slope_classes(self.p_factor_segments)
+        # Client-side equivalents; slopes past the last bin without an
+        # open-ended segment fall back to the default, as remap() does
+        self._p_bins = np.array(
+            [segment["max"] for segment in self.p_factor_segments if segment["max"] is not None],
+            dtype=np.float64,
+        )
+        p_values = list(self.p_slope_class_values)
+        if len(p_values) == self._p_bins.size:
+            p_values.append(self.p_factor_default)
+        self._p_values = np.array(p_values, dtype=np.float32)
 
         # Soil loss clamp
         self.soil_loss_clamp_min = float(
@@ -173,12 +232,24 @@ class RUSLECalculator:
         self.soil_loss_clamp_max = float(
             self.config.get("soil_loss.clamp_max", 200.0)
         )
+        self.soil_loss_expression = self._build_soil_loss_expression(
+            self.soil_loss_clamp_min, self.soil_loss_clamp_max
+        )
 
         # Erosion class definitions
         self.erosion_classes = self._prepare_erosion_classes(
             self.config.get("erosion_classes", [])
         )
         self.erosion_class_labels = {cls["key"]: cls["label"] for cls in self.erosion_classes}
+        self._erosion_edges = np.array(
+            [cls["max"] if cls["max"] is not None else np.inf for cls in self.erosion_classes],
+            dtype=np.float64,
+        )
+        self._erosion_mins = np.array(
+            [cls["min"] for cls in self.erosion_classes], dtype=np.float64
+        )
+        self.erosion_class_expression = self._build_erosion_class_expression(self.erosion_classes)
+        self._pixel_area_image = None  # created on first use (EE is not initialized yet)
 
         # Rainfall statistics parameters
         self.rainfall_mean_scale = float(
@@ -194,64 +265,116 @@ class RUSLECalculator:
             self.config.get("rainfall_statistics.cv_interpretation", [])
         )
 
+        # Threshold arrays for searchsorted-based interpretation; a missing
+        # bound is open-ended (-inf for trend minimums, +inf for CV maximums)
+        self._trend_thresholds = np.array(
+            [
+                float("-inf") if rule["min"] is None else rule["min"]
+                for rule in self.rainfall_trend_rules
+            ],
+            dtype=np.float64,
+        )
+        self._trend_labels = np.array(
+            [rule["label"] for rule in self.rainfall_trend_rules], dtype=object
+        )
+        self._cv_thresholds = np.array(
+            [
+                float("inf") if rule["max"] is None else rule["max"]
+                for rule in self.rainfall_cv_rules
+            ],
+            dtype=np.float64,
+        )
+        self._cv_labels = np.array(
+            [rule["label"] for rule in self.rainfall_cv_rules], dtype=object
+        )
+        # Labels for the no-data rainfall response (fixed per configuration)
+        self._zero_trend_label = self._interpret_trend(0.0)
+        self._zero_cv_label = self._interpret_cv(0.0)
+
         self.include_config_snapshot = bool(
             self.config.get("logging.include_config_snapshot", True)
         )
 
-    def _prepare_p_factor_segments(
-        self, raw_breakpoints: Optional[Sequence[Mapping[str, Any]]]
-    ) -> List[Dict[str, Optional[float]]]:
-        default_breakpoints = [
-            {"max": 5.0, "value": 0.10},
-            {"max": 10.0, "value": 0.12},
-            {"max": 20.0, "value": 0.14},
-            {"max": 30.0, "value": 0.19},
-            {"max": 50.0, "value": 0.25},
-            {"max": 100.0, "value": 0.33},
-            {"max": None, "value": 0.33},
-        ]
-
-        if not raw_breakpoints:
-            raw_breakpoints = []
-
-        finite_segments: List[Dict[str, float]] = []
-        infinite_segments: List[Dict[str, Optional[float]]] = []
-        for entry in raw_breakpoints:
-            value = entry.get("value")
-            try:
-                value = float(value)
-            except (TypeError, ValueError):
-                continue
+    @staticmethod
+    def _build_p_slope_classes(
+        segments: Sequence[Mapping[str, Optional[float]]]
+    ) -> Tuple[str, List[float]]:
+        """
+        Build a single EE expression that bins slope (``s``) into segment
+        indices, plus the P value for each index. Finite maxima are ascending,
+        so the index is the number of maxima the slope exceeds; the first
+        open-ended segment (if any) covers slopes above the last maximum.
+        """
+        finite = [segment for segment in segments if segment["max"] is not None]
+        open_ended = [segment for segment in segments if segment["max"] is None]
+        terms = [f"(s > {float(segment['max'])!r})" for segment in finite]
+        expression = " + ".join(terms) if terms else "s * 0"
+        values = [float(segment["value"]) for segment in finite]
+        if open_ended:
+            values.append(float(open_ended[0]["value"]))
+        return expression, values
 
-            max_slope = entry.get("max_slope")
-            if max_slope is None:
-                infinite_segments.append({"max": None, "value": value})
-                continue
+    @staticmethod
+    def _expr_number(value: float) -> str:
+        """Format a float as an EE expression literal (no exponent notation)"""
+        text = np.format_float_positional(float(value), trim="-")
+        return f"({text})" if text.startswith("-") else text
 
-            try:
-                finite_segments.append({"max": float(max_slope), "value": value})
-            except (TypeError, ValueError):
-                continue
+    @classmethod
+    def _build_k_factor_expression(cls, params: KFactorParams) -> str:
+        """
+        K = B * M^m * A * (OMs - OM) + adj, where sand and SOC are scaled to
+        the fine-sand fraction and organic matter, silt is the residual and
+        M = silt + sand * (100 - clay). ``adj`` carries the structure and
+        permeability terms, which only depend on per-call codes.
+        """
+        n = cls._expr_number
+        sand = f"(sand * {n(params.sand_fraction_multiplier)})"
+        organic_matter = f"(soc * {n(params.soc_to_organic_multiplier)})"
+        silt = f"(100 - {sand} - clay)"
+        m_param = f"({silt} + {sand} * (100 - clay))"
+        return (
+            f"{n(params.base_constant)} * pow({m_param}, {n(params.m_exponent)})"
+            f" * {n(params.area_factor)}"
+            f" * ({n(params.organic_matter_subtract)} - {organic_matter}) + adj"
+        )
 
-        if not finite_segments and not infinite_segments:
-            finite_segments = default_breakpoints[:-1]  # type: ignore[assignment]
-            infinite_segments = [default_breakpoints[-1]]  # type: ignore[list-item]
+    @classmethod
+    def _build_ls_factor_expression(cls, params: LSFactorParams) -> str:
+        """
+        LS = (flow_acc * cell / L0)^f * (sin(slope) / S0)^s, with slope in
+        degrees. Zero flow accumulation counts as 1 and a zero slope as the
+        minimum slope; both substitutions are written as boolean arithmetic.
+        """
+        n = cls._expr_number
+        flow = "(flow_acc + (flow_acc == 0))"
+        slope_rad = f"((slope == 0) * {n(params.minimum_slope_radians)} + slope * {n(math.pi / 180.0)})"
+        return (
+            f"pow({flow} * cell / {n(params.flow_length_reference)}, {n(params.flow_exponent)})"
+            f" * pow(sin({slope_rad}) / {n(params.slope_normalisation)}, {n(params.slope_exponent)})"
+        )
 
-        finite_segments.sort(key=lambda item: item["max"])
+    @classmethod
+    def _build_soil_loss_expression(cls, clamp_min: float, clamp_max: float) -> str:
+        """A = R * K * LS * C * P, clamped to [clamp_min, clamp_max]"""
+        n = cls._expr_number
+        return f"min(max(R * K * LS * C * P, {n(clamp_min)}), {n(clamp_max)})"
 
-        segments: List[Dict[str, Optional[float]]] = []
-        previous_max: Optional[float] = None
-        for entry in finite_segments + infinite_segments:
-            max_value = entry["max"]
-            segments.append(
-                {
-                    "min": previous_max,
-                    "max": max_value,
-                    "value": float(entry["value"]),
-                }
-            )
-            previous_max = max_value
-        return segments
+    @classmethod
+    def _build_erosion_class_expression(cls, classes: Sequence[Mapping[str, Any]]) -> str:
+        """
+        Nested ternary mapping soil loss (``b``) to its erosion class index,
+        or -1 when it falls outside every class
+        """
+        n = cls._expr_number
+        expression = "-1"
+        for index in reversed(range(len(classes))):
+            entry = classes[index]
+            condition = f"b >= {n(entry['min'])}"
+            if entry["max"] is not None:
+                condition += f" && b < {n(entry['max'])}"
+            expression = f"({condition}) ? {index} : {expression}"
+        return expression
 
     def _prepare_erosion_classes(
         self, classes: Optional[Sequence[Mapping[str, Any]]]
@@ -264,27 +387,30 @@ class RUSLECalculator:
             {"key": "excessive", "label": "Excessive", "min": 50.0, "max": None},
         ]
 
+        entries = [entry for entry in (classes or []) if entry.get("key")]
+        if not entries:
+            return default_classes
+
+        minima = np.fromiter(
+            (float(entry.get("min", 0.0)) for entry in entries),
+            dtype=np.float64,
+            count=len(entries),
+        )
         processed: List[Dict[str, Any]] = []
-        if classes:
-            for entry in classes:
-                key = entry.get("key")
-                if not key:
-                    continue
-                processed.append(
-                    {
-                        "key": str(key),
-                        "label": str(entry.get("label", key)),
-                        "min": float(entry.get("min", 0.0)),
-                        "max": (
-                            float(entry["max"])
-                            if entry.get("max") is not None
-                            else None
-                        ),
-                    }
-                )
-        if not processed:
-            processed = default_classes
-        processed.sort(key=lambda item: item["min"])
+        for index in np.argsort(minima, kind="stable").tolist():
+            entry = entries[index]
+            processed.append(
+                {
+                    "key": str(entry["key"]),
+                    "label": str(entry.get("label", entry["key"])),
+                    "min": float(minima[index]),
+                    "max": (
+                        float(entry["max"])
+                        if entry.get("max") is not None
+                        else None
+                    ),
+                }
+            )
         return processed
 
     def _prepare_trend_rules(
@@ -355,18 +481,21 @@ class RUSLECalculator:
         return processed
 
     def _interpret_trend(self, value: float) -> str:
-        for rule in self.rainfall_trend_rules:
-            threshold = rule["min"]
-            if threshold is None or value >= threshold:
-                return rule["label"]
-        return self.rainfall_trend_rules[-1]["label"]
+        return str(self._interpret_trend_batch(np.asarray([value]))[0])
+
+    def _interpret_trend_batch(self, values: np.ndarray) -> np.ndarray:
+        """Label each trend value with the first rule whose minimum it reaches."""
+        # Rules are sorted by descending minimum, so search on negated thresholds
+        idx = np.searchsorted(-self._trend_thresholds, -np.asarray(values, dtype=np.float64), side="left")
+        return self._trend_labels[np.minimum(idx, self._trend_labels.size - 1)]
 
     def _interpret_cv(self, value: float) -> str:
-        for rule in self.rainfall_cv_rules:
-            threshold = rule["max"]
-            if threshold is None or value < threshold:
-                return rule["label"]
-        return self.rainfall_cv_rules[-1]["label"]
+        return str(self._interpret_cv_batch(np.asarray([value]))[0])
+
+    def _interpret_cv_batch(self, values: np.ndarray) -> np.ndarray:
+        """Label each CV value with the first rule whose maximum exceeds it."""
+        idx = np.searchsorted(self._cv_thresholds, np.asarray(values, dtype=np.float64), side="right")
+        return self._cv_labels[np.minimum(idx, self._cv_labels.size - 1)]
 
     def config_snapshot(self) -> Dict[str, Any]:
         return self.config.to_dict()
@@ -383,7 +512,41 @@ class RUSLECalculator:
             return collection.filterBounds(geometry)
         return collection
     
+    @staticmethod
+    def _geom_key(geometry):
+        """
+        Hash an ee.Geometry by its serialized graph (client-side, no getInfo)
+        """
+        if geometry is None:
+            return None
+        return hashlib.blake2b(geometry.serialize().encode(), digest_size=16).hexdigest()
+    
+    def _cached(self, cache, key, builder):
+        """
+        Return cache[key], building and storing it on a miss.
+        Caches are bounded LRU dicts holding at most GRAPH_CACHE_SIZE images.
+        """
+        with self._cache_lock:
+            if key in cache:
+                cache.move_to_end(key)
+                return cache[key]
+        value = builder()
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.GRAPH_CACHE_SIZE:
+                cache.popitem(last=False)
+        return value
+    
     def _load_modis_landcover(self, year, geometry):
+        """Load MODIS land cover image for supplied year (memoized per geometry)"""
+        return self._cached(
+            self._lc_cache,
+            (year, self._geom_key(geometry)),
+            lambda: self._build_modis_landcover(year, geometry)
+        )
+    
+    def _build_modis_landcover(self, year, geometry):
         """Load MODIS land cover image for supplied year, clipped to geometry"""
         start_date = f'{year}-01-01'
         end_date = f'{year}-12-31'
@@ -401,45 +564,64 @@ class RUSLECalculator:
         land_cover_image = land_cover_image.select('LC_Type1')
         return self._clip_image(land_cover_image, geometry)
     
+    def _get_slope_deg(self, geometry):
+        """SRTM slope in degrees, shared by the LS and P factors (memoized per geometry)"""
+        return self._cached(
+            self._slope_cache,
+            self._geom_key(geometry),
+            lambda: self._build_slope_deg(geometry)
+        )
+    
+    def _build_slope_deg(self, geometry):
+        dem = ee.Image('USGS/SRTMGL1_003').select('elevation')
+        dem = self._clip_image(dem, geometry)
+        return ee.Terrain.slope(dem)
+    
+    @_log_errors("R-factor")
     def compute_r_factor(self, year, geometry=None, use_long_term=True):
         """
         Compute R-Factor (Rainfall Erosivity)
         Using CHIRPS precipitation data
+        The long-term baseline does not depend on year, so it is memoized per geometry
         """
-        try:
-            params = self.r_factor_params
-            if use_long_term and params["use_long_term_default"]:
-                start_year = params["long_term_start_year"]
-                end_year = params["long_term_end_year"]
-                start_date = f'{start_year}-01-01'
-                end_date = f'{end_year}-01-01'
-                years = max(1, end_year - start_year)
-            else:
-                start_date = f'{year}-01-01'
-                end_date = f'{year + 1}-01-01'
-                years = 1
-            
-            # Load CHIRPS precipitation data
-            chirps = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY') \
-                .filterDate(start_date, end_date) \
-                .select('precipitation')
-            chirps = self._filter_collection(chirps, geometry)
-            
-            # Calculate annual precipitation
-            total_precip = chirps.sum().toFloat()
-            mean_precip = total_precip.divide(years)
-            
-            # Linear R-factor approximation from GEE workflow
-            r_factor = mean_precip.multiply(params["coefficient"]).add(params["intercept"])
-            r_factor = r_factor.max(0)
-            r_factor = self._clip_image(r_factor, geometry)
-            
-            return r_factor.rename('R_factor')
-            
-        except Exception as e:
-            logger.error(f"Failed to compute R-factor: {str(e)}")
-            raise
+        params = self.r_factor_params
+        if use_long_term and params.use_long_term_default:
+            start_year = params.long_term_start_year
+            end_year = params.long_term_end_year
+            return self._cached(
+                self._r_cache,
+                (start_year, end_year, self._geom_key(geometry)),
+                lambda: self._build_r_factor(
+                    f'{start_year}-01-01',
+                    f'{end_year}-01-01',
+                    max(1, end_year - start_year),
+                    geometry
+                )
+            )
+        
+        return self._build_r_factor(f'{year}-01-01', f'{year + 1}-01-01', 1, geometry)
     
+    def _build_r_factor(self, start_date, end_date, years, geometry):
+        params = self.r_factor_params
+        
+        # Load CHIRPS precipitation data
+        chirps = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY') \
+            .filterDate(start_date, end_date) \
+            .select('precipitation')
+        chirps = self._filter_collection(chirps, geometry)
+        
+        # Calculate annual precipitation
+        total_precip = chirps.sum().toFloat()
+        mean_precip = total_precip.divide(years)
+        
+        # Linear R-factor approximation from GEE workflow
+        r_factor = mean_precip.multiply(params.coefficient).add(params.intercept)
+        r_factor = r_factor.max(0)
+        r_factor = self._clip_image(r_factor, geometry)
+        
+        return r_factor.rename('R_factor')
+    
+    @_log_errors("range-based R-factor")
     def compute_r_factor_range(self, start_year, end_year, geometry=None):
         """
         Compute R-Factor using mean annual rainfall over a multi-year range.
@@ -451,181 +633,153 @@ class RUSLECalculator:
         if end_year < start_year:
             raise ValueError("end_year must be greater than or equal to start_year")
         
-        try:
-            start_date = f'{start_year}-01-01'
-            end_date = f'{end_year + 1}-01-01'
-            years = max(1, (end_year - start_year + 1))
-            
-            chirps = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY') \
-                .filterDate(start_date, end_date) \
-                .select('precipitation')
-            chirps = self._filter_collection(chirps, geometry)
-            
-            total_precip = chirps.sum().toFloat()
-            mean_precip = total_precip.divide(years)
-            
-            params = self.r_factor_params
-            r_factor = mean_precip.multiply(params["coefficient"]).add(params["intercept"])
-            r_factor = r_factor.max(0)
-            r_factor = self._clip_image(r_factor, geometry)
-            
-            return r_factor.rename('R_factor')
-        except Exception as e:
-            logger.error(f"Failed to compute range-based R-factor: {str(e)}")
-            raise
+        return self._build_r_factor(
+            f'{start_year}-01-01',
+            f'{end_year + 1}-01-01',
+            max(1, (end_year - start_year + 1)),
+            geometry
+        )
     
     def compute_k_factor(self, geometry=None, structure_code=2, permeability_code=3):
         """
         Compute K-Factor (Soil Erodibility)
-        Using OpenLandMap soil fraction data
+        Using OpenLandMap soil fraction data (memoized per geometry)
         """
-        try:
-            clay = ee.Image("OpenLandMap/SOL/SOL_CLAY-WFRACTION_USDA-3A1A1A_M/v02").select('b0')
-            sand = ee.Image("OpenLandMap/SOL/SOL_SAND-WFRACTION_USDA-3A1A1A_M/v02").select('b0')
-            organic_carbon = ee.Image("OpenLandMap/SOL/SOL_ORGANIC-CARBON_USDA-6A1C_M/v02").select('b0')
-            
-            clay = self._clip_image(clay, geometry)
-            sand = self._clip_image(sand, geometry).multiply(
-                self.k_factor_params["sand_fraction_multiplier"]
-            )
-            organic_carbon = self._clip_image(organic_carbon, geometry)
-            
-            # Convert SOC (%) to organic matter (%)
-            organic_matter = organic_carbon.multiply(
-                self.k_factor_params["soc_to_organic_multiplier"]
-            )
-            
-            # Derive silt as residual
-            silt = ee.Image.constant(100).subtract(sand).subtract(clay)
-            
-            # Compute M parameter
-            M = silt.add(sand.multiply(ee.Image.constant(100).subtract(clay)))
-            
-            base_k = ee.Image(self.k_factor_params["base_constant"]) \
-                .multiply(M.pow(self.k_factor_params["m_exponent"])) \
-                .multiply(self.k_factor_params["area_factor"]) \
-                .multiply(
-                    ee.Image(self.k_factor_params["organic_matter_subtract"]).subtract(organic_matter)
-                )
-            
-            k_factor = base_k \
-                .add(
-                    ee.Image(self.k_factor_params["structure_coefficient"]).multiply(
-                        ee.Image(structure_code).subtract(self.k_factor_params["structure_baseline"])
-                    )
-                ) \
-                .add(
-                    ee.Image(self.k_factor_params["permeability_coefficient"]).multiply(
-                        ee.Image(permeability_code).subtract(self.k_factor_params["permeability_baseline"])
-                    )
-                )
-            
-            k_factor = k_factor.max(0)
-            k_factor = self._clip_image(k_factor, geometry)
-            
-            return k_factor.rename('K_factor')
-            
-        except Exception as e:
-            logger.error(f"Failed to compute K-factor: {str(e)}")
-            raise
+        return self._cached(
+            self._k_cache,
+            (self._geom_key(geometry), structure_code, permeability_code),
+            lambda: self._build_k_factor(geometry, structure_code, permeability_code)
+        )
+    
+    @_log_errors("K-factor")
+    def _build_k_factor(self, geometry, structure_code, permeability_code):
+        clay = ee.Image("OpenLandMap/SOL/SOL_CLAY-WFRACTION_USDA-3A1A1A_M/v02").select('b0')
+        sand = ee.Image("OpenLandMap/SOL/SOL_SAND-WFRACTION_USDA-3A1A1A_M/v02").select('b0')
+        organic_carbon = ee.Image("OpenLandMap/SOL/SOL_ORGANIC-CARBON_USDA-6A1C_M/v02").select('b0')
+        
+        # Clip the inputs once; the expression output inherits their footprint
+        clay = self._clip_image(clay, geometry)
+        sand = self._clip_image(sand, geometry)
+        organic_carbon = self._clip_image(organic_carbon, geometry)
+        
+        params = self.k_factor_params
+        adjustment = params.structure_coefficient * (structure_code - params.structure_baseline) \
+            + params.permeability_coefficient * (permeability_code - params.permeability_baseline)
+        
+        k_factor = clay.expression(self.k_factor_expression, {
+            'clay': clay,
+            'sand': sand,
+            'soc': organic_carbon,
+            'adj': float(adjustment)
+        })
+        
+        k_factor = k_factor.max(0)
+        
+        return k_factor.rename('K_factor')
     
     def compute_ls_factor(self, geometry=None, grid_size=None):
         """
         Compute LS-Factor (Slope Length and Steepness)
-        Using SRTM DEM and HydroSHEDS flow accumulation
+        Using SRTM DEM and HydroSHEDS flow accumulation (memoized per geometry)
         """
-        try:
-            params = self.ls_factor_params
-            grid_size = grid_size or self.flow_acc_grid_size
-            
-            dem = ee.Image('USGS/SRTMGL1_003').select('elevation')
-            dem = self._clip_image(dem, geometry)
-            
-            slope_deg = ee.Terrain.slope(dem)
-            slope_rad = slope_deg.multiply(math.pi / 180.0)
-            slope_rad = slope_rad.where(
-                slope_rad.eq(0),
-                params["minimum_slope_radians"]
+        grid_size = grid_size or self.flow_acc_grid_size
+        return self._cached(
+            self._ls_cache,
+            (self._geom_key(geometry), grid_size),
+            lambda: self._build_ls_factor(geometry, grid_size)
+        )
+    
+    @_log_errors("LS-factor")
+    def _build_ls_factor(self, geometry, grid_size):
+        slope_deg = self._get_slope_deg(geometry)
+        
+        flow_acc = ee.Image("WWF/HydroSHEDS/30ACC")
+        flow_acc = self._clip_image(flow_acc, geometry)
+        
+        # Degree-to-radian conversion, zero-slope floor and zero-flow guard
+        # all happen inside the expression
+        ls_factor = flow_acc.expression(self.ls_factor_expression, {
+            'flow_acc': flow_acc,
+            'slope': slope_deg,
+            'cell': float(grid_size)
+        })
+        
+        ls_factor = ls_factor.max(0)
+        
+        return ls_factor.rename('LS_factor')
+    
+    def _c_factor_remap_lists(self):
+        """C-factor remap source/target lists, wrapped as ee.List once"""
+        if self._c_remap_lists is None:
+            self._c_remap_lists = (
+                ee.List(self.c_factor_classes),
+                ee.List(self.c_factor_values)
             )
-            sin_slope = slope_rad.sin()
-            
-            flow_acc = ee.Image("WWF/HydroSHEDS/30ACC")
-            flow_acc = self._clip_image(flow_acc, geometry)
-            flow_acc = flow_acc.where(flow_acc.eq(0), 1)
-            
-            ls_factor = flow_acc.multiply(grid_size) \
-                .divide(params["flow_length_reference"]) \
-                .pow(params["flow_exponent"]) \
-                .multiply(
-                    sin_slope.divide(params["slope_normalisation"]).pow(
-                        params["slope_exponent"]
-                    )
-                )
-            
-            ls_factor = ls_factor.max(0)
-            ls_factor = self._clip_image(ls_factor, geometry)
-            
-            return ls_factor.rename('LS_factor')
-            
-        except Exception as e:
-            logger.error(f"Failed to compute LS-factor: {str(e)}")
-            raise
+        return self._c_remap_lists
     
     def compute_c_factor(self, year, geometry=None):
         """
         Compute C-Factor (Cover Management)
         Using MODIS land cover mapping
         """
-        try:
-            land_cover = self._load_modis_landcover(year, geometry)
-            
-            # Remap MODIS IGBP classes to C-factor values (based on provided GEE script)
-            c_factor = land_cover.remap(
-                self.c_factor_classes,
-                self.c_factor_values,
-                self.c_factor_default
-            ).rename('C_factor')
-            c_factor = self._clip_image(c_factor, geometry)
-            
-            return c_factor.rename('C_factor')
-            
-        except Exception as e:
-            logger.error(f"Failed to compute C-factor: {str(e)}")
-            raise
+        return self._c_factor_from_landcover(self._load_modis_landcover(year, geometry))
+    
+    @_log_errors("C-factor")
+    def _c_factor_from_landcover(self, land_cover):
+        # Land cover is already clipped, so the remapped image needs no extra clip
+        # Remap MODIS IGBP classes to C-factor values (based on provided GEE script);
+        # float32 is plenty for the coefficients and halves the band size
+        c_from, c_to = self._c_factor_remap_lists()
+        c_factor = land_cover.remap(
+            c_from,
+            c_to,
+            self.c_factor_default
+        ).toFloat()
+        
+        return c_factor.rename('C_factor')
     
     def compute_p_factor(self, year, geometry=None):
         """
         Compute P-Factor (Conservation Practice)
         Using MODIS land cover with slope-dependent coefficients for cropland
         """
-        try:
-            land_cover = self._load_modis_landcover(year, geometry)
-            
-            dem = ee.Image('USGS/SRTMGL1_003').select('elevation')
-            dem = self._clip_image(dem, geometry)
-            slope_deg = ee.Terrain.slope(dem)
-            
-            p_factor = ee.Image.constant(self.p_factor_default)
-            p_factor = self._clip_image(p_factor, geometry)
-            
-            cropland = land_cover.eq(self.p_factor_cropland_class)
-            for segment in self.p_factor_segments:
-                condition = cropland
-                min_slope = segment["min"]
-                max_slope = segment["max"]
-                if min_slope is not None:
-                    condition = condition.And(slope_deg.gt(min_slope))
-                if max_slope is not None:
-                    condition = condition.And(slope_deg.lte(max_slope))
-                p_factor = p_factor.where(condition, segment["value"])
-            
-            return p_factor.rename('P_factor')
-            
-        except Exception as e:
-            logger.error(f"Failed to compute P-factor: {str(e)}")
-            raise
+        return self._p_factor_from_landcover(self._load_modis_landcover(year, geometry), geometry)
     
-    def compute_rusle(self, year, geometry, scale=1000, compute_stats=True, r_factor_image=None):
+    @_log_errors("P-factor")
+    def _p_factor_from_landcover(self, land_cover, geometry):
+        slope_deg = self._get_slope_deg(geometry)
+        
+        p_factor = ee.Image.constant(self.p_factor_default)
+        p_factor = self._clip_image(p_factor, geometry)
+        
+        # Bin slope into segments with one expression, then map bins to P values
+        slope_class = slope_deg.expression(
+            self.p_slope_class_expression, {'s': slope_deg}
+        ).toInt()
+        cropland_p = slope_class.remap(
+            list(range(len(self.p_slope_class_values))),
+            self.p_slope_class_values,
+            self.p_factor_default
+        )
+        
+        cropland = land_cover.eq(self.p_factor_cropland_class)
+        p_factor = p_factor.where(cropland, cropland_p)
+        
+        return p_factor.rename('P_factor')
+    
+    def p_factor_array(self, slope_deg, is_cropland):
+        """
+        Client-side P-factor for NumPy slope (degrees) and cropland mask arrays,
+        binned the same way as compute_p_factor (a slope equal to a breakpoint
+        stays in the lower segment)
+        """
+        slope_deg = np.asarray(slope_deg, dtype=np.float64)
+        cropland_p = self._p_values[np.digitize(slope_deg, self._p_bins, right=True)]
+        return np.where(is_cropland, cropland_p, np.float32(self.p_factor_default))
+    
+    @_log_errors("RUSLE")
+    def compute_rusle(self, year, geometry, scale=1000, compute_stats=True, r_factor_image=None,
+                      tile_scale=None):
         """
         Compute full RUSLE erosion rate
         A = R * K * LS * C * P
@@ -636,65 +790,70 @@ class RUSLECalculator:
             geometry: Area geometry
             scale: Resolution in meters (default 1000m/1km)
             compute_stats: Whether to compute statistics (can be slow for large areas)
+            tile_scale: Statistics reducer tileScale (defaults to Config.GEE_TILE_SCALE)
         """
-        try:
-            logger.info(f"Computing RUSLE for year {year} at {scale}m resolution")
-            
-            # Compute all factors
-            if r_factor_image is not None:
-                r_factor = self._clip_image(r_factor_image, geometry)
-            else:
-                r_factor = self.compute_r_factor(year, geometry)
-            k_factor = self.compute_k_factor(geometry)
-            ls_factor = self.compute_ls_factor(geometry)
-            c_factor = self.compute_c_factor(year, geometry)
-            p_factor = self.compute_p_factor(year, geometry)
-            
-            # Calculate soil loss: A = R * K * LS * C * P
-            soil_loss = r_factor.multiply(k_factor) \
-                .multiply(ls_factor) \
-                .multiply(c_factor) \
-                .multiply(p_factor) \
-                .clamp(self.soil_loss_clamp_min, self.soil_loss_clamp_max)
-            
-            # Ensure single band output (select first band if multiple exist)
-            soil_loss = soil_loss.select([0])
-            soil_loss = soil_loss.rename('soil_loss')
+        logger.info(f"Computing RUSLE for year {year} at {scale}m resolution")
+        
+        # The fused soil loss image only depends on year and region, so repeat
+        # requests reuse the whole graph; an explicit R image bypasses the cache
+        if r_factor_image is None:
+            soil_loss = self._cached(
+                self._soil_loss_cache,
+                (year, self._geom_key(geometry)),
+                lambda: self._build_soil_loss(year, geometry)
+            )
+        else:
+            soil_loss = self._build_soil_loss(year, geometry, r_factor_image)
+        
+        # Compute statistics only if requested (can be slow for large areas)
+        if compute_stats:
+            logger.info(f"  Computing statistics at {scale}m scale...")
+            stats = gee_service.compute_statistics(soil_loss, geometry, scale=scale, tile_scale=tile_scale)
             
-            # Compute statistics only if requested (can be slow for large areas)
-            if compute_stats:
-                logger.info(f"  Computing statistics at {scale}m scale...")
-                stats = gee_service.compute_statistics(soil_loss, geometry, scale=scale)
-                
-                # Helper function to safely round values, handling None
-                def safe_round(value, decimals=2):
-                    if value is None:
-                        return 0.0
-                    try:
-                        return round(float(value), decimals)
-                    except (TypeError, ValueError):
-                        return 0.0
-                
-                return {
-                    'image': soil_loss,
-                    'statistics': {
-                        'mean': safe_round(stats.get('soil_loss_mean', 0)),
-                        'min': safe_round(stats.get('soil_loss_min', 0)),
-                        'max': safe_round(stats.get('soil_loss_max', 0)),
-                        'std_dev': safe_round(stats.get('soil_loss_stdDev', 0))
-                    }
-                }
-            else:
-                # Return without statistics for faster processing
-                return {
-                    'image': soil_loss,
-                    'statistics': None
+            return {
+                'image': soil_loss,
+                'statistics': {
+                    'mean': _safe_round(stats.get('soil_loss_mean', 0)),
+                    'min': _safe_round(stats.get('soil_loss_min', 0)),
+                    'max': _safe_round(stats.get('soil_loss_max', 0)),
+                    'std_dev': _safe_round(stats.get('soil_loss_stdDev', 0))
                 }
-            
-        except Exception as e:
-            logger.error(f"Failed to compute RUSLE: {str(e)}")
-            raise
+            }
+        else:
+            # Return without statistics for faster processing
+            return {
+                'image': soil_loss,
+                'statistics': None
+            }
+    
+    def _build_soil_loss(self, year, geometry, r_factor_image=None):
+        # C and P share one land cover graph; load it once for both
+        land_cover = self._load_modis_landcover(year, geometry)
+        
+        # Compute all factors
+        if r_factor_image is not None:
+            r_factor = self._clip_image(r_factor_image, geometry)
+        else:
+            r_factor = self.compute_r_factor(year, geometry)
+        k_factor = self.compute_k_factor(geometry)
+        ls_factor = self.compute_ls_factor(geometry)
+        c_factor = self._c_factor_from_landcover(land_cover)
+        p_factor = self._p_factor_from_landcover(land_cover, geometry)
+        
+        # Calculate soil loss: A = R * K * LS * C * P as one fused expression
+        # (product and clamp in a single pixel pass); each factor contributes
+        # only its first band so the output stays single-band
+        soil_loss = r_factor.expression(self.soil_loss_expression, {
+            'R': r_factor.select([0]),
+            'K': k_factor.select([0]),
+            'LS': ls_factor.select([0]),
+            'C': c_factor.select([0]),
+            'P': p_factor.select([0])
+        }).rename('soil_loss')
+        
+        return soil_loss
     
+    @_log_errors("rainfall statistics", exc_info=True)
     def compute_rainfall_statistics(self, start_year, end_year, geometry, scale: Optional[int] = None):
         """
         Compute rainfall statistics for a multi-year range.
@@ -710,97 +869,104 @@ class RUSLECalculator:
         if end_year < start_year:
             raise ValueError("end_year must be greater than or equal to start_year")
         
-        try:
-            base_scale = self.rainfall_mean_scale
-            requested_scale = scale if scale is not None else base_scale
-            analysis_scale = max(requested_scale, base_scale)
+        base_scale = self.rainfall_mean_scale
+        requested_scale = scale if scale is not None else base_scale
+        analysis_scale = max(requested_scale, base_scale)
 
-            years_sequence = ee.List.sequence(start_year, end_year)
-            
-            def annual_total(year):
-                year = ee.Number(year)
-                start = ee.Date.fromYMD(year, 1, 1)
-                end = start.advance(1, 'year')
-                
-                collection = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY') \
-                    .filterDate(start, end) \
-                    .select('precipitation')
-                collection = self._filter_collection(collection, geometry)
-                
-                total = collection.sum().toFloat()
-                return total.set('year', year)
-            
-            annual_collection = ee.ImageCollection(years_sequence.map(annual_total))
-            
-            def image_to_feature(image):
-                reduction = image.reduceRegion(
-                    reducer=ee.Reducer.mean(),
-                    geometry=geometry,
-                    scale=analysis_scale,
-                    bestEffort=True,
-                    maxPixels=1e13
-                )
-                return ee.Feature(None, {
-                    'year': image.get('year'),
-                    'mean_precip': reduction.get('precipitation')
-                })
+        def annual_total(year):
+            year = ee.Number(year)
+            start = ee.Date.fromYMD(year, 1, 1)
+            end = start.advance(1, 'year')
             
-            rainfall_series = ee.FeatureCollection(annual_collection.map(image_to_feature)).getInfo()
-            features = rainfall_series.get('features', []) if rainfall_series else []
-            
-            yearly_values = []
-            for feature in features:
-                properties = feature.get('properties', {})
-                year = properties.get('year')
-                mean_precip = properties.get('mean_precip')
-                if year is None or mean_precip is None:
-                    continue
-                try:
-                    yearly_values.append({
-                        'year': int(round(year)),
-                        'mean_precip': float(mean_precip)
-                    })
-                except (TypeError, ValueError):
-                    continue
-            
-            yearly_values.sort(key=lambda item: item['year'])
-            
-            if not yearly_values:
-                return {
-                    'mean_annual_rainfall_mm': 0.0,
-                    'trend_mm_per_year': 0.0,
-                    'coefficient_of_variation_percent': 0.0,
-                    'trend_interpretation': self._interpret_trend(0.0),
-                    'variability_interpretation': self._interpret_cv(0.0),
-                    'analysis_scale_m': analysis_scale,
-                    'yearly_totals_mm': []
-                }
-            
-            years = np.array([item['year'] for item in yearly_values], dtype=float)
-            rainfall_vals = np.array([item['mean_precip'] for item in yearly_values], dtype=float)
-            
-            mean_rainfall = float(np.mean(rainfall_vals))
-            std_rainfall = float(np.std(rainfall_vals))
-            cv_percent = float((std_rainfall / mean_rainfall) * 100) if mean_rainfall > 0 else 0.0
-            
-            trend_slope = 0.0
-            if years.size >= 2:
-                slope, _ = np.polyfit(years, rainfall_vals, 1)
-                trend_slope = float(slope)
+            collection = ee.ImageCollection('UCSB-CHG/CHIRPS/DAILY') \
+                .filterDate(start, end) \
+                .select('precipitation')
+            collection = self._filter_collection(collection, geometry)
             
+            total = collection.sum().toFloat()
+            # Index by year so toBands() names bands "<year>_precipitation"
+            return total.set('year', year).set('system:index', year.format('%d'))
+        
+        def reduce_years(batch_years):
+            # Stack the batch as bands and reduce them in a single pass;
+            # years without data have no band and are simply absent
+            annual_collection = ee.ImageCollection(ee.List(batch_years).map(annual_total))
+            return annual_collection.toBands().reduceRegion(
+                reducer=ee.Reducer.mean(),
+                geometry=geometry,
+                scale=analysis_scale,
+                bestEffort=True,
+                maxPixels=1e13,
+                tileScale=Config.GEE_TILE_SCALE
+            ).getInfo() or {}
+        
+        # Split the range into short batches evaluated concurrently so a
+        # long range is not a single serial server-side graph
+        all_years = list(range(start_year, end_year + 1))
+        year_batches = [
+            all_years[i:i + self.RAINFALL_YEAR_BATCH]
+            for i in range(0, len(all_years), self.RAINFALL_YEAR_BATCH)
+        ]
+        yearly_means = {}
+        with ThreadPoolExecutor(max_workers=min(self.RAINFALL_MAX_WORKERS, len(year_batches))) as executor:
+            for batch_means in executor.map(reduce_years, year_batches):
+                yearly_means.update(batch_means)
+        
+        # Band names are "<year>_precipitation"; years with a null mean are skipped
+        yearly = np.fromiter(
+            (
+                (int(band_name.split('_', 1)[0]), float(value))
+                for band_name, value in yearly_means.items()
+                if value is not None
+            ),
+            dtype=self.YEARLY_RAINFALL_DTYPE
+        )
+        yearly.sort(order='year')
+        years = yearly['year'].astype(np.float64)
+        rainfall_vals = yearly['mean_precip']
+        
+        if years.size == 0:
             return {
-                'mean_annual_rainfall_mm': round(mean_rainfall, 2),
-                'trend_mm_per_year': round(trend_slope, 4),
-                'coefficient_of_variation_percent': round(cv_percent, 2),
-                'trend_interpretation': self._interpret_trend(trend_slope),
-                'variability_interpretation': self._interpret_cv(cv_percent),
+                'mean_annual_rainfall_mm': 0.0,
+                'trend_mm_per_year': 0.0,
+                'coefficient_of_variation_percent': 0.0,
+                'trend_interpretation': self._zero_trend_label,
+                'variability_interpretation': self._zero_cv_label,
                 'analysis_scale_m': analysis_scale,
-                'yearly_totals_mm': yearly_values
+                'yearly_totals_mm': []
             }
-        except Exception as e:
-            logger.error(f"Failed to compute rainfall statistics: {str(e)}", exc_info=True)
-            raise
+        
+        mean_rainfall = float(np.mean(rainfall_vals))
+        std_rainfall = float(np.std(rainfall_vals))
+        cv_percent = float((std_rainfall / mean_rainfall) * 100) if mean_rainfall > 0 else 0.0
+        
+        trend_slope = 0.0
+        if years.size >= 2:
+            # Closed-form least-squares slope (years are distinct, so dy.dy > 0)
+            dy = years - years.mean()
+            trend_slope = float(np.dot(dy, rainfall_vals - mean_rainfall) / np.dot(dy, dy))
+        
+        return {
+            'mean_annual_rainfall_mm': round(mean_rainfall, 2),
+            'trend_mm_per_year': round(trend_slope, 4),
+            'coefficient_of_variation_percent': round(cv_percent, 2),
+            'trend_interpretation': self._interpret_trend(trend_slope),
+            'variability_interpretation': self._interpret_cv(cv_percent),
+            'analysis_scale_m': analysis_scale,
+            'yearly_totals_mm': [
+                {'year': int(year), 'mean_precip': mean_precip}
+                for year, mean_precip in zip(years.tolist(), rainfall_vals.tolist())
+            ]
+        }
+    
+    def classify_array(self, vals):
+        """
+        Classify a client-side soil loss array into erosion class indices
+        (positions in self.erosion_classes, -1 for invalid/no-data pixels)
+        """
+        return classify_erosion(vals, self._erosion_edges, self._erosion_mins)
     
+    @_log_errors("erosion class breakdown", exc_info=True)
     def compute_erosion_class_breakdown(self, soil_loss_image, geometry, scale=1000):
         """
         Compute percentage area for predefined erosion classes.
@@ -816,70 +982,248 @@ class RUSLECalculator:
             raise ValueError("geometry is required to compute erosion class breakdown")
         
         try:
-            pixel_area = ee.Image.pixelArea().rename('area')
-            valid_mask = soil_loss_image.gte(0)
-            total_area = ee.Number(
-                pixel_area.updateMask(valid_mask).reduceRegion(
-                    reducer=ee.Reducer.sum(),
-                    geometry=geometry,
-                    scale=scale,
-                    bestEffort=True,
-                    maxPixels=1e13
-                ).get('area')
-            )
-            
-            def class_area(lower, upper):
-                mask = soil_loss_image.gte(lower)
-                if upper is not None:
-                    mask = mask.And(soil_loss_image.lt(upper))
-                return ee.Number(
-                    pixel_area.updateMask(mask).reduceRegion(
-                        reducer=ee.Reducer.sum(),
-                        geometry=geometry,
-                        scale=scale,
-                        bestEffort=True,
-                        maxPixels=1e13
-                    ).get('area')
-                )
-            
-            class_areas = {'total': total_area}
+            areas_dict, total_area_m2 = self._grouped_class_areas(soil_loss_image, geometry, scale)
+        except Exception as e:
+            logger.warning(f"Grouped class area reduction failed, reducing per class: {str(e)}")
+            areas_dict, total_area_m2 = self._per_class_areas(soil_loss_image, geometry, scale)
+        
+        if total_area_m2 <= 0:
+            result = {}
             for cls in self.erosion_classes:
-                class_areas[cls['key']] = class_area(cls['min'], cls['max'])
-            areas_dict = ee.Dictionary(class_areas).getInfo()
-            
-            total_area_m2 = float(areas_dict.get('total') or 0.0)
-            if total_area_m2 <= 0:
-                result = {}
-                for cls in self.erosion_classes:
-                    result[cls['key']] = {
-                        'label': cls['label'],
-                        'percentage': 0.0,
-                        'area_hectares': 0.0
-                    }
-                result['total_area_hectares'] = 0.0
-                return result
-            
-            def to_output(key: str, label: str):
-                area_m2 = float(areas_dict.get(key) or 0.0)
-                area_ha = area_m2 / 10000.0
-                percentage = (area_m2 / total_area_m2) * 100.0 if total_area_m2 > 0 else 0.0
-                return {
-                    'label': label,
-                    'percentage': round(percentage, 2),
-                    'area_hectares': round(area_ha, 2)
+                result[cls['key']] = {
+                    'label': cls['label'],
+                    'percentage': 0.0,
+                    'area_hectares': 0.0
                 }
-            
-            output = {
-                cls['key']: to_output(cls['key'], cls['label'])
-                for cls in self.erosion_classes
+            result['total_area_hectares'] = 0.0
+            return result
+        
+        def to_output(key: str, label: str):
+            area_m2 = float(areas_dict.get(key) or 0.0)
+            area_ha = area_m2 / 10000.0
+            percentage = (area_m2 / total_area_m2) * 100.0 if total_area_m2 > 0 else 0.0
+            return {
+                'label': label,
+                'percentage': round(percentage, 2),
+                'area_hectares': round(area_ha, 2)
             }
-            output['total_area_hectares'] = round(total_area_m2 / 10000.0, 2)
-            return output
+        
+        output = {
+            cls['key']: to_output(cls['key'], cls['label'])
+            for cls in self.erosion_classes
+        }
+        output['total_area_hectares'] = round(total_area_m2 / 10000.0, 2)
+        return output
+    
+    def _pixel_area(self):
+        """Shared pixel-area image ('area' band, m²)"""
+        if self._pixel_area_image is None:
+            self._pixel_area_image = ee.Image.pixelArea().rename('area')
+        return self._pixel_area_image
+    
+    def _grouped_class_areas(self, soil_loss_image, geometry, scale):
+        """
+        Area (m²) per erosion class key plus total valid area, from one grouped
+        sum of pixel area by class index; valid pixels outside every class fall
+        in group -1 and only count towards the total
+        """
+        valid_mask = soil_loss_image.gte(0)
+        class_image = soil_loss_image.expression(
+            self.erosion_class_expression, {'b': soil_loss_image}
+        ).toInt().rename('class')
+        grouped = self._pixel_area() \
+            .addBands(class_image) \
+            .updateMask(valid_mask) \
+            .reduceRegion(
+                reducer=ee.Reducer.sum().group(groupField=1, groupName='class'),
+                geometry=geometry,
+                scale=scale,
+                bestEffort=True,
+                maxPixels=1e13,
+                tileScale=Config.GEE_TILE_SCALE
+            ).getInfo() or {}
+        
+        class_keys = [cls['key'] for cls in self.erosion_classes]
+        areas_dict = {}
+        total_area_m2 = 0.0
+        for group in grouped.get('groups', []):
+            area_m2 = float(group.get('sum') or 0.0)
+            total_area_m2 += area_m2
+            class_index = int(group.get('class', -1))
+            if 0 <= class_index < len(class_keys):
+                areas_dict[class_keys[class_index]] = area_m2
+        return areas_dict, total_area_m2
+    
+    def _per_class_areas(self, soil_loss_image, geometry, scale):
+        """
+        Fallback for _grouped_class_areas: the total valid area first, then
+        one masked area sum per class, fetched concurrently
+        """
+        pixel_area = self._pixel_area()
+        
+        def masked_area(mask):
+            return pixel_area.updateMask(mask).reduceRegion(
+                reducer=ee.Reducer.sum(),
+                geometry=geometry,
+                scale=scale,
+                bestEffort=True,
+                maxPixels=1e13,
+                tileScale=Config.GEE_TILE_SCALE
+            ).get('area').getInfo()
+        
+        # Empty regions (no valid pixels) need no per-class queries
+        total_area_m2 = float(masked_area(soil_loss_image.gte(0)) or 0.0)
+        if total_area_m2 <= 0:
+            return {}, 0.0
+        
+        masks = {}
+        for cls in self.erosion_classes:
+            mask = soil_loss_image.gte(cls['min'])
+            if cls['max'] is not None:
+                mask = mask.And(soil_loss_image.lt(cls['max']))
+            masks[cls['key']] = mask
+        
+        areas_dict = {}
+        with ThreadPoolExecutor(max_workers=min(6, len(masks))) as executor:
+            futures = {executor.submit(masked_area, mask): key for key, mask in masks.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    areas_dict[key] = float(future.result() or 0.0)
+                except Exception as e:
+                    logger.warning(f"Area reduction for class '{key}' failed: {str(e)}")
+        
+        return areas_dict, total_area_m2
+    
+    @staticmethod
+    def _cell_grid_transform(bbox, cell_width, cell_height):
+        """EPSG:4326 crsTransform whose pixels are exactly the grid cells"""
+        return [cell_width, 0, bbox['min_lon'], 0, cell_height, bbox['min_lat']]
+    
+    def _coarsen_input_scale(self, cell_width, cell_height, sample_scale):
+        """
+        Input pixel size (m) for mean-aggregating onto grid cells: sample_scale,
+        or coarser so that a cell plus the partial pixels on its edges spans at
+        most MAX_REDUCE_PIXELS inputs
+        """
+        pixels_per_side = math.isqrt(self.MAX_REDUCE_PIXELS) - 1
+        return max(sample_scale, max(cell_width, cell_height) * self.METERS_PER_DEGREE / pixels_per_side)
+    
+    def _cells_fit_one_pixel(self, cell_width, cell_height, sample_scale):
+        """True when a grid cell is no larger than one sample_scale pixel"""
+        return max(cell_width, cell_height) * self.METERS_PER_DEGREE <= sample_scale
+    
+    def _coarsen_for_sampling(self, soil_loss_image, bbox, cell_width, cell_height, sample_scale):
+        """
+        Return the image to reduce over grid cells on the cell grid
+        (_cell_grid_transform). When a cell spans more than one sample_scale
+        pixel, the image is mean-aggregated onto that grid, so each cell holds
+        the mean of the input pixels it covers; smaller cells are left to take
+        the pixel under their centre.
+        """
+        if self._cells_fit_one_pixel(cell_width, cell_height, sample_scale):
+            return soil_loss_image
+        
+        input_scale = self._coarsen_input_scale(cell_width, cell_height, sample_scale)
+        return soil_loss_image \
+            .setDefaultProjection(crs='EPSG:4326', scale=input_scale) \
+            .reduceResolution(reducer=ee.Reducer.mean(), maxPixels=self.MAX_REDUCE_PIXELS) \
+            .reproject(crs='EPSG:4326', crsTransform=self._cell_grid_transform(bbox, cell_width, cell_height))
+    
+    @staticmethod
+    def _parse_sample_rows(rows):
+        """
+        Split sampled rows (feature property dicts or CSV records) into
+        (cell_idx, soil_loss) arrays, skipping rows without a cell_idx;
+        a missing soil_loss counts as 0
+        """
+        rows = [row for row in rows if row.get('cell_idx') not in (None, '')]
+        cell_idx = np.fromiter(
+            (int(float(row['cell_idx'])) for row in rows), dtype=np.int64, count=len(rows)
+        )
+        soil_loss = np.fromiter(
+            (float(row.get('soil_loss') or 0.0) for row in rows), dtype=np.float64, count=len(rows)
+        )
+        return cell_idx, soil_loss
+    
+    def _download_sample_rows(self, sampled_fc):
+        """
+        Fetch only the cell_idx/soil_loss columns of a sampled collection as a
+        streamed CSV download instead of a getInfo GeoJSON payload
+        """
+        url = sampled_fc.getDownloadURL(filetype='CSV', selectors=['cell_idx', 'soil_loss'])
+        with requests.get(url, stream=True, timeout=Config.GEE_API_TIMEOUT) as response:
+            response.raise_for_status()
+            return self._parse_sample_rows(
+                csv.DictReader(response.iter_lines(decode_unicode=True))
+            )
+    
+    @classmethod
+    def _simplify_geojson(cls, geojson, tolerance_m):
+        """
+        Douglas-Peucker simplify a GeoJSON geometry with shapely (topology
+        preserved). tolerance_m is converted to degrees along a meridian, which
+        is conservative east-west. Returns None when shapely is unavailable or
+        the geometry cannot be simplified.
+        """
+        try:
+            import shapely
+            from shapely.geometry import shape
+            
+            simplified = shape(geojson).simplify(
+                tolerance_m / cls.METERS_PER_DEGREE, preserve_topology=True
+            )
+            if simplified.is_empty:
+                return None
+            return json.loads(shapely.to_geojson(simplified))
         except Exception as e:
-            logger.error(f"Failed to compute erosion class breakdown: {str(e)}", exc_info=True)
-            raise
+            logger.warning(f"    Client-side simplification unavailable: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _spread_cells(cell_x, cell_y, candidates, limit):
+        """
+        Return up to ``limit`` candidate cell indices in Z-curve order. When
+        there are more candidates, they are thinned with an even stride along
+        the curve, which spreads the kept cells over the whole region (a stride
+        over idx = x * grid_size + y would alias with the grid rows).
+        """
+        candidates = np.asarray(candidates, dtype=np.int64)
+        candidates = candidates[morton_order(cell_x[candidates], cell_y[candidates])]
+        if candidates.size > limit:
+            candidates = candidates[np.linspace(0, candidates.size - 1, limit).round().astype(np.int64)]
+        return candidates.tolist()
     
-    def compute_detailed_grid(self, year, geometry, grid_size=10, bbox=None, geojson=None):
+    @staticmethod
+    def _cells_intersecting_region(cell_bounds, geojson, by_center=False):
+        """
+        Return indices of grid cells that can receive a value: cells whose bbox
+        intersects the region GeoJSON or, with by_center, cells whose centre
+        lies in it (cells that take the pixel under their centre).
+        cell_bounds is a (min_lon, min_lat, max_lon, max_lat) tuple of arrays.
+        Uses a shapely STRtree so the test runs client-side; returns None when
+        no GeoJSON is available or shapely cannot parse it.
+        """
+        if not geojson:
+            return None
+        try:
+            from shapely import STRtree, box, points
+            from shapely.geometry import shape
+            
+            region = shape(geojson)
+            min_lon, min_lat, max_lon, max_lat = cell_bounds
+            if by_center:
+                cells = points((min_lon + max_lon) / 2, (min_lat + max_lat) / 2)
+            else:
+                cells = box(min_lon, min_lat, max_lon, max_lat)
+            tree = STRtree(cells)
+            return sorted(int(idx) for idx in tree.query(region, predicate='intersects'))
+        except Exception as e:
+            logger.warning(f"    Skipping cell pre-filter: {str(e)}")
+            return None
+    
+    @_log_errors("detailed grid", exc_info=True)
+    def compute_detailed_grid(self, year, geometry, grid_size=10, bbox=None, geojson=None, tile_scale=None):
         """
         Compute detailed erosion grid for visualization
         Returns cell-by-cell erosion data
@@ -888,272 +1232,316 @@ class RUSLECalculator:
         Args:
             bbox: Optional pre-calculated bbox as [minLon, minLat, maxLon, maxLat]
             geojson: Optional original GeoJSON for complexity analysis
+            tile_scale: Sampling tileScale (defaults to Config.GEE_TILE_SCALE)
         """
-        try:
-            logger.info(f"Computing detailed grid for year {year}, grid_size={grid_size}")
-            
-            # OPTIMIZATION 1: Analyze geometry complexity
-            logger.info("  Step 1/5: Analyzing geometry complexity...")
-            if geojson:
-                complexity = gee_service.analyze_geometry_complexity(geojson, geometry)
-                logger.info(f"    Complexity: {complexity['complexity_level']} "
-                          f"({complexity['coord_count']} coords, {complexity['area_km2']} km²)")
-                
-                # Use recommended parameters
-                params = complexity['recommended']
-                simplify_tolerance = params['simplify_tolerance']
-                rusle_scale = params['rusle_scale']
-                sample_scale = params['sample_scale']
-                recommended_grid = params['grid_size']
-                max_samples = params['max_samples']
-                batch_size = params['batch_size']
-                max_workers = params['max_workers']
-                
-                # Use smaller grid if recommended and not overridden
-                if grid_size == 10:  # If using default
-                    grid_size = recommended_grid
-                    logger.info(f"    Adjusted grid_size: {grid_size}x{grid_size} (optimized for area size)")
-                
-                logger.info(f"    Optimization parameters:")
-                logger.info(f"      - Simplify tolerance: {simplify_tolerance}m")
-                logger.info(f"      - RUSLE scale: {rusle_scale}m")
-                logger.info(f"      - Sample scale: {sample_scale}m")
-                logger.info(f"      - Max samples: {max_samples}")
-                logger.info(f"      - Batch size: {batch_size}, Workers: {max_workers}")
-            else:
-                # Use default optimized parameters
-                from config import Config
-                simplify_tolerance = 1000
-                rusle_scale = 150
-                sample_scale = 100
-                max_samples = Config.MAX_SAMPLES_LARGE_AREA
-                batch_size = Config.BATCH_SIZE_OPTIMIZED
-                max_workers = Config.MAX_WORKERS_OPTIMIZED
-                logger.info("    Using default optimized parameters")
-            
-            # OPTIMIZATION 2: Simplify geometry BEFORE computation
-            logger.info(f"  Step 2/5: Simplifying geometry (tolerance: {simplify_tolerance}m)...")
+        logger.info(f"Computing detailed grid for year {year}, grid_size={grid_size}")
+        
+        # Erosion rarely changes for a given region/year/config, so reuse
+        # previously computed grids when the original GeoJSON is available
+        cache_key = None
+        if geojson:
+            cache_key = result_cache.make_key(
+                'detailed-grid',
+                self.GRID_CACHE_VERSION,
+                year,
+                grid_size,
+                bbox,
+                self.config.fingerprint(),
+                geometry_fingerprint(geojson)
+            )
+            cached = result_cache.get(cache_key)
+            if cached is not None:
+                logger.info("  ✓ Returning cached detailed grid")
+                return cached
+        
+        # OPTIMIZATION 1: Analyze geometry complexity
+        logger.info("  Step 1/5: Analyzing geometry complexity...")
+        if geojson:
+            complexity = gee_service.analyze_geometry_complexity(geojson, geometry)
+            logger.info(f"    Complexity: {complexity['complexity_level']} "
+                      f"({complexity['coord_count']} coords, {complexity['area_km2']} km²)")
+            
+            # Use recommended parameters
+            params = complexity['recommended']
+            simplify_tolerance = params['simplify_tolerance']
+            rusle_scale = params['rusle_scale']
+            sample_scale = params['sample_scale']
+            recommended_grid = params['grid_size']
+            max_samples = params['max_samples']
+            
+            # Use smaller grid if recommended and not overridden
+            if grid_size == 10:  # If using default
+                grid_size = recommended_grid
+                logger.info(f"    Adjusted grid_size: {grid_size}x{grid_size} (optimized for area size)")
+            
+            logger.info(f"    Optimization parameters:")
+            logger.info(f"      - Simplify tolerance: {simplify_tolerance}m")
+            logger.info(f"      - RUSLE scale: {rusle_scale}m")
+            logger.info(f"      - Sample scale: {sample_scale}m")
+            logger.info(f"      - Max samples: {max_samples}")
+        else:
+            # Use default optimized parameters
+            simplify_tolerance = 1000
+            rusle_scale = 150
+            sample_scale = 100
+            max_samples = Config.MAX_SAMPLES_LARGE_AREA
+            logger.info("    Using default optimized parameters")
+        
+        # OPTIMIZATION 2: Simplify geometry BEFORE computation
+        logger.info(f"  Step 2/5: Simplifying geometry (tolerance: {simplify_tolerance}m)...")
+        # Simplify the GeoJSON on the client when possible so EE receives the
+        # reduced polygon instead of a simplify() node in every downstream graph
+        simplified_geojson = self._simplify_geojson(geojson, simplify_tolerance) if geojson else None
+        if simplified_geojson is not None:
+            simplified_geometry = ee.Geometry(simplified_geojson)
+        else:
             simplified_geometry = geometry.simplify(maxError=simplify_tolerance)
-            logger.info("    ✓ Geometry simplified")
-            
-            # OPTIMIZATION 3: Compute RUSLE with adaptive scale
-            logger.info(f"  Step 3/5: Computing RUSLE soil loss image (scale: {rusle_scale}m)...")
-            rusle_result = self.compute_rusle(year, simplified_geometry, scale=rusle_scale, compute_stats=False)
-            soil_loss_image = rusle_result['image']
-            
-            # Get bounding box (use pre-calculated if provided)
-            logger.info("  Step 4/5: Calculating bounding box...")
-            if bbox and len(bbox) == 4:
-                logger.info(f"    Using pre-calculated bbox: {bbox}")
-                bbox_dict = {
-                    'min_lon': bbox[0],
-                    'min_lat': bbox[1],
-                    'max_lon': bbox[2],
-                    'max_lat': bbox[3]
-                }
+        logger.info("    ✓ Geometry simplified")
+        
+        # OPTIMIZATION 3: Compute RUSLE with adaptive scale
+        logger.info(f"  Step 3/5: Computing RUSLE soil loss image (scale: {rusle_scale}m)...")
+        rusle_result = self.compute_rusle(year, simplified_geometry, scale=rusle_scale, compute_stats=False)
+        soil_loss_image = rusle_result['image']
+        
+        # Get bounding box (use pre-calculated if provided)
+        logger.info("  Step 4/5: Calculating bounding box...")
+        if bbox and len(bbox) == 4:
+            logger.info(f"    Using pre-calculated bbox: {bbox}")
+            bbox_dict = {
+                'min_lon': bbox[0],
+                'min_lat': bbox[1],
+                'max_lon': bbox[2],
+                'max_lat': bbox[3]
+            }
+        else:
+            # Derive it from the original GeoJSON when available (no EE round trip)
+            bbox_dict = gee_service.bbox_from_geojson(geojson) if geojson else None
+            if bbox_dict is not None:
+                logger.info("    Derived bbox from GeoJSON coordinates")
             else:
                 logger.info("    Calling GEE to calculate bbox...")
                 bbox_dict = gee_service.calculate_bbox(simplified_geometry)
+        
+        # Use the bbox dict
+        bbox = bbox_dict
+        
+        # Calculate cell dimensions
+        lon_range = bbox['max_lon'] - bbox['min_lon']
+        lat_range = bbox['max_lat'] - bbox['min_lat']
+        cell_width = lon_range / grid_size
+        cell_height = lat_range / grid_size
+        
+        # Cells are only shown as one value each, so reduce a copy of the image
+        # averaged onto the cell grid instead of full-resolution pixels
+        sampling_image = self._coarsen_for_sampling(
+            soil_loss_image, bbox, cell_width, cell_height, sample_scale
+        )
+        
+        logger.info(f"  Step 5/5: Creating {grid_size}x{grid_size} grid and sampling erosion values...")
+        
+        # Grid cells are plain client-side bboxes held as parallel arrays indexed by
+        # idx = x * grid_size + y; cell shapes are only ever emitted as bbox polygons
+        # Edges come from linspace so adjacent cells share exact edges and the
+        # last cell ends exactly on the bbox
+        lon_edges = np.linspace(bbox['min_lon'], bbox['max_lon'], grid_size + 1)
+        lat_edges = np.linspace(bbox['min_lat'], bbox['max_lat'], grid_size + 1)
+        cell_x = np.repeat(np.arange(grid_size), grid_size)
+        cell_y = np.tile(np.arange(grid_size), grid_size)
+        cell_min_lon = lon_edges[cell_x]
+        cell_min_lat = lat_edges[cell_y]
+        cell_max_lon = lon_edges[cell_x + 1]
+        cell_max_lat = lat_edges[cell_y + 1]
+        centers_lon = bbox['min_lon'] + (np.arange(grid_size) + 0.5) * cell_width
+        centers_lat = bbox['min_lat'] + (np.arange(grid_size) + 0.5) * cell_height
+        cell_centers = np.stack(
+            [grid.ravel() for grid in np.meshgrid(centers_lon, centers_lat, indexing='ij')],
+            axis=1
+        )
+        
+        # OPTIMIZATION 4: Smart sampling - limit to max_samples for large areas
+        total_cells = cell_x.size
+        logger.info(f"    Created {total_cells} cells")
+        
+        used_fallback = False
+        try:
+            # Drop cells that cannot get a value before they take up sample slots
+            by_center = self._cells_fit_one_pixel(cell_width, cell_height, sample_scale)
+            candidate_indices = self._cells_intersecting_region(
+                (cell_min_lon, cell_min_lat, cell_max_lon, cell_max_lat), geojson, by_center=by_center
+            )
             
-            # Use the bbox dict
-            bbox = bbox_dict
-            
-            # Calculate cell dimensions
-            lon_range = bbox['max_lon'] - bbox['min_lon']
-            lat_range = bbox['max_lat'] - bbox['min_lat']
-            cell_width = lon_range / grid_size
-            cell_height = lat_range / grid_size
-            
-            logger.info(f"  Step 5/5: Creating {grid_size}x{grid_size} grid and sampling erosion values...")
-            
-            # Create ALL grid cell geometries as Earth Engine objects (client-side, no API calls)
-            grid_cells = []
-            for i in range(grid_size):
-                for j in range(grid_size):
-                    min_lon = bbox['min_lon'] + (i * cell_width)
-                    max_lon = min_lon + cell_width
-                    min_lat = bbox['min_lat'] + (j * cell_height)
-                    max_lat = min_lat + cell_height
-                    
-                    # Create cell geometry (EE object, not fetched yet)
-                    cell_geom = ee.Geometry.Rectangle([min_lon, min_lat, max_lon, max_lat])
-                    clipped_cell = cell_geom.intersection(simplified_geometry, ee.ErrorMargin(1))
-                    
-                    grid_cells.append({
-                        'x': i,
-                        'y': j,
-                        'geometry': clipped_cell,
-                        'bbox': [min_lon, min_lat, max_lon, max_lat]
-                    })
-            
-            # OPTIMIZATION 4: Smart sampling - limit to max_samples for large areas
-            total_cells = len(grid_cells)
-            logger.info(f"    Created {total_cells} cells")
+            # Build the cell rectangles (or centres) server-side from the cell
+            # indices (idx = x * grid_size + y); only indices are sent to GEE
+            def cell_rectangle(idx):
+                idx = ee.Number(idx)
+                west = idx.divide(grid_size).floor().multiply(cell_width).add(bbox['min_lon'])
+                south = idx.mod(grid_size).multiply(cell_height).add(bbox['min_lat'])
+                rectangle = ee.Geometry.Rectangle(
+                    [west, south, west.add(cell_width), south.add(cell_height)], geodesic=False
+                )
+                return ee.Feature(rectangle, {'cell_idx': idx})
             
-            try:
-                # Create sample points at cell centers
-                point_features = []
-                for idx, cell in enumerate(grid_cells):
-                    bbox_cell = cell['bbox']
-                    center_lon = (bbox_cell[0] + bbox_cell[2]) / 2
-                    center_lat = (bbox_cell[1] + bbox_cell[3]) / 2
-                    point = ee.Geometry.Point([center_lon, center_lat])
-                    
-                    # Create a feature with the cell index
-                    feature = ee.Feature(point, {'cell_idx': idx})
-                    point_features.append(feature)
-                
-                # Create a FeatureCollection with all points and filter to region
-                points_fc = ee.FeatureCollection(point_features)
-                points_in_region = points_fc.filterBounds(simplified_geometry)
-                
-                # OPTIMIZATION: Limit samples for very large areas
-                sample_limit = min(total_cells, max_samples)
-                logger.info(f"    Sampling {sample_limit} points (optimized from {total_cells} cells)")
-                logger.info(f"    Using batch_size={batch_size}, workers={max_workers}")
-                
-                def sample_batch(batch_start, batch_end):
-                    """Sample a batch of points in parallel"""
-                    try:
-                        batch_fc = points_in_region.toList(batch_end - batch_start, batch_start)
-                        batch_fc = ee.FeatureCollection(batch_fc)
-                        
-                        sample_result = soil_loss_image.sampleRegions(
-                            collection=batch_fc,
-                            scale=sample_scale,  # Use adaptive scale
-                            geometries=False
-                        ).getInfo()
-                        
-                        return sample_result.get('features', [])
-                    except Exception as e:
-                        logger.warning(f"    Batch {batch_start}-{batch_end} failed: {str(e)}")
-                        return []
-                
-                # Execute parallel sampling with optimized parameters
-                all_samples = []
-                with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    futures = []
-                    for batch_start in range(0, sample_limit, batch_size):
-                        batch_end = min(batch_start + batch_size, sample_limit)
-                        future = executor.submit(sample_batch, batch_start, batch_end)
-                        futures.append(future)
-                    
-                    # Collect results as they complete
-                    for future in as_completed(futures):
-                        try:
-                            batch_samples = future.result(timeout=45)  # Reduced timeout
-                            all_samples.extend(batch_samples)
-                            logger.info(f"    ✓ Batch complete ({len(all_samples)} total samples so far)")
-                        except Exception as e:
-                            logger.warning(f"    Batch failed: {str(e)}")
-                
-                samples = {'features': all_samples}
-                logger.info(f"    ✓ Received {len(all_samples)} samples from GEE (parallel, optimized)")
-                
-            except Exception as e:
-                logger.error(f"    ✗ Failed to sample regions: {str(e)}")
-                samples = None
+            def cell_center(idx):
+                idx = ee.Number(idx)
+                center_lon = idx.divide(grid_size).floor().add(0.5).multiply(cell_width).add(bbox['min_lon'])
+                center_lat = idx.mod(grid_size).add(0.5).multiply(cell_height).add(bbox['min_lat'])
+                return ee.Feature(ee.Geometry.Point([center_lon, center_lat]), {'cell_idx': idx})
             
-            # If sampling returns no features, fall back to simpler approach
-            if not samples or 'features' not in samples or len(samples['features']) == 0:
-                logger.warning("  Sampling returned no results, using center point sampling...")
-                # Sample each center point individually
-                erosion_values_dict = {}
-                for idx, cell in enumerate(grid_cells):
-                    bbox_cell = cell['bbox']
-                    center_lon = (bbox_cell[0] + bbox_cell[2]) / 2
-                    center_lat = (bbox_cell[1] + bbox_cell[3]) / 2
-                    point = ee.Geometry.Point([center_lon, center_lat])
-                    
-                    # Check if point is within the geometry
-                    if idx < 5:  # Only sample first 5 for speed
-                        try:
-                            sample = soil_loss_image.sample(point, 30).first().getInfo()
-                            if sample and 'properties' in sample:
-                                erosion_values_dict[idx] = sample['properties'].get('soil_loss', 0)
-                        except:
-                            pass
+            if candidate_indices is not None:
+                logger.info(f"    Pre-filtered to {len(candidate_indices)}/{total_cells} cells in the region")
                 
-                # Don't use default values - only return cells with actual data
-                # This ensures we only show cells inside the region
-                pass  # erosion_values_dict already has the sampled values
+                # OPTIMIZATION: Limit cells for very large areas, spread over the region
+                # and in Z-curve order so neighbouring cells reuse the same GEE tiles;
+                # cell_idx keeps the original position
+                cell_indices = self._spread_cells(cell_x, cell_y, candidate_indices, max_samples)
+                sample_limit = len(cell_indices)
+                cells_fc = ee.FeatureCollection(ee.List(cell_indices).map(cell_rectangle))
             else:
-                # Extract erosion values from samples using cell_idx
-                erosion_values_dict = {}
-                for feature in samples['features']:
-                    if 'properties' in feature:
-                        cell_idx = feature['properties'].get('cell_idx')
-                        soil_loss = feature['properties'].get('soil_loss', 0)
-                        if cell_idx is not None:
-                            erosion_values_dict[cell_idx] = soil_loss
-            
-            # Build result cells (only include cells with erosion data - these are inside the region)
-            cells = []
-            erosion_values = []
-            
-            for idx, cell in enumerate(grid_cells):
-                erosion_rate = erosion_values_dict.get(idx, 0)
-                
-                # Only include cells with valid erosion data (sampling automatically filters to region)
-                if erosion_rate is not None and erosion_rate > 0:
-                    erosion_values.append(erosion_rate)
-                    
-                    # Use simple bbox geometry instead of fetching actual clipped geometry
-                    bbox_cell = cell['bbox']
-                    cell_geojson = {
-                        'type': 'Polygon',
-                        'coordinates': [[
-                            [bbox_cell[0], bbox_cell[1]],
-                            [bbox_cell[2], bbox_cell[1]],
-                            [bbox_cell[2], bbox_cell[3]],
-                            [bbox_cell[0], bbox_cell[3]],
-                            [bbox_cell[0], bbox_cell[1]]
-                        ]]
-                    }
-                    
-                    cells.append({
-                        'x': cell['x'],
-                        'y': cell['y'],
-                        'erosion_rate': round(float(erosion_rate), 2),
-                        'geometry': cell_geojson
-                    })
-            
-            # Calculate statistics from cell values
-            if erosion_values:
-                mean_erosion = sum(erosion_values) / len(erosion_values)
-                min_erosion = min(erosion_values)
-                max_erosion = max(erosion_values)
-                
-                # Calculate standard deviation
-                variance = sum((x - mean_erosion) ** 2 for x in erosion_values) / len(erosion_values)
-                std_dev = math.sqrt(variance)
+                # No client-side pre-filter: drop cells outside the region with
+                # filterBounds before the limit, so the budget goes to cells with data
+                all_indices = ee.List.sequence(0, total_cells - 1)
+                if by_center:
+                    cells_fc = ee.FeatureCollection(all_indices.map(cell_center)) \
+                        .filterBounds(simplified_geometry) \
+                        .map(lambda feature: cell_rectangle(feature.get('cell_idx')))
+                else:
+                    cells_fc = ee.FeatureCollection(all_indices.map(cell_rectangle)) \
+                        .filterBounds(simplified_geometry)
+                sample_limit = min(total_cells, max_samples)
+                if total_cells > max_samples:
+                    # Seeded random thinning keeps the budget spread over the region
+                    keep_fraction = ee.Number(max_samples).divide(cells_fc.size().max(1))
+                    cells_fc = cells_fc \
+                        .randomColumn('spread', 0) \
+                        .filter(ee.Filter.lt('spread', keep_fraction)) \
+                        .limit(max_samples)
+            logger.info(f"    Reducing up to {sample_limit} cells (optimized from {total_cells} cells)")
+            
+            # One reduceRegions request covers every cell: the EE planner splits the
+            # work server-side (tileScale) instead of us fanning out getInfo batches.
+            # It runs on the cell grid, where each rectangle holds exactly one pixel
+            sampled_fc = sampling_image.reduceRegions(
+                collection=cells_fc,
+                reducer=ee.Reducer.mean().setOutputs(['soil_loss']),
+                crs='EPSG:4326',
+                crsTransform=self._cell_grid_transform(bbox, cell_width, cell_height),
+                tileScale=tile_scale or Config.GEE_TILE_SCALE
+            )
+            if sample_limit > self.CSV_SAMPLE_THRESHOLD:
+                # Large grids: stream just the two needed columns as CSV
+                sample_idx, sample_val = self._download_sample_rows(sampled_fc)
             else:
-                # No valid cells with erosion data
-                mean_erosion = min_erosion = max_erosion = std_dev = 0
+                # Table endpoint; the whole sample fits in one page at this size
+                sampled = ee.data.computeFeatures({
+                    'expression': sampled_fc,
+                    'pageSize': self.CSV_SAMPLE_THRESHOLD
+                })
+                sample_idx, sample_val = self._parse_sample_rows(
+                    feature.get('properties') or {}
+                    for feature in sampled.get('features', [])
+                )
             
-            logger.info(f"  ✓ Grid complete: {len(cells)} cells with data")
+            logger.info(f"    ✓ Received {sample_idx.size} cell values from GEE")
             
-            # OPTIMIZATION 5: Skip boundary fetch - frontend already has geometry
-            # This saves 1-2 minutes on complex geometries
-            logger.info("  ✓ Skipping boundary fetch (optimization - frontend has geometry)")
+        except Exception as e:
+            # An empty result is a real answer (no data in the region); only a
+            # failed request falls back to sampling a few cell centres
+            logger.error(f"    ✗ Failed to reduce grid cells: {str(e)}")
+            logger.warning("  Falling back to center point sampling...")
+            used_fallback = True
+            sample_idx = np.empty(0, dtype=np.int64)
+            sample_val = np.empty(0, dtype=np.float64)
+            # Sample the first few center points (for speed) in a single request
+            fallback_points = ee.FeatureCollection([
+                ee.Feature(ee.Geometry.Point(center), {'cell_idx': idx})
+                for idx, center in enumerate(cell_centers[:5].tolist())
+            ])
+            try:
+                fallback_samples = soil_loss_image.sampleRegions(
+                    collection=fallback_points,
+                    scale=30,
+                    geometries=False
+                ).getInfo()
+                sample_idx, sample_val = self._parse_sample_rows(
+                    feature.get('properties') or {}
+                    for feature in fallback_samples.get('features', [])
+                )
+            except Exception as e:
+                logger.warning(f"    Center point sampling failed: {str(e)}")
             
-            return {
-                'cells': cells,
-                'statistics': {
-                    'mean': round(mean_erosion, 2),
-                    'min': round(min_erosion, 2),
-                    'max': round(max_erosion, 2),
-                    'std_dev': round(std_dev, 2)
-                },
-                'grid_size': grid_size,
-                'bbox': [bbox['min_lon'], bbox['min_lat'], bbox['max_lon'], bbox['max_lat']],
-                'cell_count': len(cells)
-                # region_boundary removed - frontend uses original geometry
+            # Don't use default values - only return cells with actual data
+            # This ensures we only show cells inside the region
+        
+        # Sampled erosion per cell, indexed by cell_idx; NaN marks cells without data
+        erosion_arr = np.full(total_cells, np.nan, dtype=np.float64)
+        erosion_arr[sample_idx] = sample_val
+        
+        # Build result cells (only include cells with erosion data - these are inside the region)
+        # Only include cells with valid erosion data (sampling automatically filters to region);
+        # NaN (missing) compares False and is dropped as well
+        keep = np.flatnonzero(erosion_arr > 0)
+        
+        # Use simple bbox polygons (N, 5, 2) instead of fetching actual clipped geometry
+        polygons = np.stack([
+            np.column_stack((cell_min_lon[keep], cell_min_lat[keep])),
+            np.column_stack((cell_max_lon[keep], cell_min_lat[keep])),
+            np.column_stack((cell_max_lon[keep], cell_max_lat[keep])),
+            np.column_stack((cell_min_lon[keep], cell_max_lat[keep])),
+            np.column_stack((cell_min_lon[keep], cell_min_lat[keep]))
+        ], axis=1)
+        kept_values = erosion_arr[keep]
+        
+        cells = [
+            {
+                'x': x,
+                'y': y,
+                'erosion_rate': rate,
+                'geometry': {'type': 'Polygon', 'coordinates': [ring]}
             }
-            
-        except Exception as e:
-            logger.error(f"Failed to compute detailed grid: {str(e)}", exc_info=True)
-            raise
+            for x, y, rate, ring in zip(
+                cell_x[keep].tolist(),
+                cell_y[keep].tolist(),
+                np.round(kept_values, 2).tolist(),
+                polygons.tolist()
+            )
+        ]
+        
+        # Calculate statistics from cell values
+        if kept_values.size:
+            mean_erosion = float(kept_values.mean())
+            min_erosion = float(kept_values.min())
+            max_erosion = float(kept_values.max())
+            std_dev = float(kept_values.std())
+        else:
+            # No valid cells with erosion data
+            mean_erosion = min_erosion = max_erosion = std_dev = 0
+        
+        logger.info(f"  ✓ Grid complete: {len(cells)} cells with data")
+        
+        # OPTIMIZATION 5: Skip boundary fetch - frontend already has geometry
+        # This saves 1-2 minutes on complex geometries
+        logger.info("  ✓ Skipping boundary fetch (optimization - frontend has geometry)")
+        
+        result = {
+            'cells': cells,
+            'statistics': {
+                'mean': round(mean_erosion, 2),
+                'min': round(min_erosion, 2),
+                'max': round(max_erosion, 2),
+                'std_dev': round(std_dev, 2)
+            },
+            'grid_size': grid_size,
+            'bbox': [bbox['min_lon'], bbox['min_lat'], bbox['max_lon'], bbox['max_lat']],
+            'cell_count': len(cells)
+            # region_boundary removed - frontend uses original geometry
+        }
+        
+        # Only cache complete grids that actually contain data; a fallback grid
+        # covers a handful of cells and must not outlive the failure
+        if cache_key and cells and not used_fallback:
+            result_cache.set(cache_key, result)
+        
+        return result
 
 # Global RUSLE calculator instance
 rusle_calculator = RUSLECalculator()
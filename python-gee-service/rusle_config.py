@@ -6,8 +6,15 @@ service and utilities for merging per-request overrides supplied by Laravel.
 """
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional
+import bisect
+import hashlib
+import json
+from dataclasses import dataclass
+from functools import lru_cache, reduce
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 
 DEFAULT_RUSLE_CONFIG: Dict[str, Any] = {
@@ -110,29 +117,174 @@ DEFAULT_RUSLE_CONFIG: Dict[str, Any] = {
 }
 
 
-def _merge_dict(base: MutableMapping[str, Any], overrides: Mapping[str, Any]) -> MutableMapping[str, Any]:
+@dataclass(frozen=True, slots=True)
+class RFactorParams:
+    """Resolved R-factor constants."""
+
+    coefficient: float
+    intercept: float
+    long_term_start_year: int
+    long_term_end_year: int
+    use_long_term_default: bool
+
+
+@dataclass(frozen=True, slots=True)
+class KFactorParams:
+    """Resolved K-factor constants."""
+
+    sand_fraction_multiplier: float
+    soc_to_organic_multiplier: float
+    base_constant: float
+    m_exponent: float
+    area_factor: float
+    organic_matter_subtract: float
+    structure_coefficient: float
+    structure_baseline: float
+    permeability_coefficient: float
+    permeability_baseline: float
+
+
+@dataclass(frozen=True, slots=True)
+class LSFactorParams:
+    """Resolved LS-factor constants."""
+
+    flow_length_reference: float
+    flow_exponent: float
+    slope_normalisation: float
+    slope_exponent: float
+    minimum_slope_radians: float
+
+
+_MISSING = object()
+
+
+@lru_cache(maxsize=256)
+def _split_path(path: str) -> tuple:
+    """Split a dotted config path once; lookups reuse the same literal paths."""
+    return tuple(path.split("."))
+
+
+def _step(current: Any, key: str) -> Any:
+    """One level of a dotted-path walk; non-mappings and missing keys yield _MISSING."""
+    return current.get(key, _MISSING) if isinstance(current, Mapping) else _MISSING
+
+
+def _freeze(value: Any) -> Any:
+    """Return a read-only copy: mappings become MappingProxyType, lists tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of ``_freeze``: a fresh, mutable dict/list copy."""
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def _merge_dict(base: Mapping[str, Any], overrides: Mapping[str, Any]) -> Mapping[str, Any]:
     """
-    Recursively merge ``overrides`` into ``base`` and return ``base``.
+    Return a read-only merge of ``overrides`` onto the read-only ``base``.
 
     Lists and non-mapping values are replaced entirely; dictionaries are merged
-    depth-wise.
+    depth-wise. Only the subtrees touched by ``overrides`` are copied, the rest
+    is shared with ``base``.
     """
+    merged = dict(base)
     for key, value in overrides.items():
-        if (
-            isinstance(value, Mapping)
-            and key in base
-            and isinstance(base[key], MutableMapping)
-        ):
-            base[key] = _merge_dict(base[key], value)  # type: ignore[arg-type]
+        current = merged.get(key)
+        if isinstance(value, Mapping) and isinstance(current, Mapping):
+            merged[key] = _merge_dict(current, value)
         else:
-            base[key] = deepcopy(value)
-    return base
+            merged[key] = _freeze(value)
+    return MappingProxyType(merged)
+
+
+_FROZEN_DEFAULT: Mapping[str, Any] = _freeze(DEFAULT_RUSLE_CONFIG)
+
+
+def _float_or_nan(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def prepare_p_factor_segments(
+    raw_breakpoints: Optional[Sequence[Mapping[str, Any]]]
+) -> List[Dict[str, Optional[float]]]:
+    """
+    Parse ``p_factor.breakpoints`` into ``{"min", "max", "value"}`` segments.
+    Entries with an unparsable value or max_slope are skipped; finite
+    segments ascend and open-ended ones follow in input order. Falls back to
+    the default breakpoints when nothing valid remains.
+    """
+    default_breakpoints = [
+        {"max": 5.0, "value": 0.10},
+        {"max": 10.0, "value": 0.12},
+        {"max": 20.0, "value": 0.14},
+        {"max": 30.0, "value": 0.19},
+        {"max": 50.0, "value": 0.25},
+        {"max": 100.0, "value": 0.33},
+        {"max": None, "value": 0.33},
+    ]
+
+    entries = list(raw_breakpoints or [])
+    count = len(entries)
+    values = np.fromiter(
+        (_float_or_nan(entry.get("value")) for entry in entries),
+        dtype=np.float64,
+        count=count,
+    )
+    open_ended = np.fromiter(
+        (entry.get("max_slope") is None for entry in entries),
+        dtype=bool,
+        count=count,
+    )
+    max_slopes = np.fromiter(
+        (_float_or_nan(entry.get("max_slope")) for entry in entries),
+        dtype=np.float64,
+        count=count,
+    )
+
+    # Drop unparsable entries; finite segments ascend, open-ended ones follow in input order
+    valid = ~np.isnan(values)
+    finite_idx = np.flatnonzero(valid & ~open_ended & ~np.isnan(max_slopes))
+    finite_idx = finite_idx[np.argsort(max_slopes[finite_idx], kind="stable")]
+    open_idx = np.flatnonzero(valid & open_ended)
+
+    if finite_idx.size == 0 and open_idx.size == 0:
+        maxima: List[Optional[float]] = [entry["max"] for entry in default_breakpoints]
+        segment_values = [float(entry["value"]) for entry in default_breakpoints]  # type: ignore[arg-type]
+    else:
+        maxima = max_slopes[finite_idx].tolist() + [None] * int(open_idx.size)
+        segment_values = values[np.concatenate((finite_idx, open_idx))].tolist()
+
+    minima = [None] + maxima[:-1]
+    return [
+        {"min": minimum, "max": maximum, "value": value}
+        for minimum, maximum, value in zip(minima, maxima, segment_values)
+    ]
 
 
 class RUSLEConfig:
     """
     Container for RUSLE configuration data with helper methods for retrieving
     nested values.
+
+    The data is held read-only, so configs share the frozen defaults instead of
+    deep-copying them; ``to_dict`` returns a mutable copy.
     """
 
     def __init__(
@@ -140,9 +292,11 @@ class RUSLEConfig:
         overrides: Optional[Mapping[str, Any]] = None,
         base: Optional[Mapping[str, Any]] = None,
     ) -> None:
-        self._data: Dict[str, Any] = deepcopy(base) if base is not None else deepcopy(DEFAULT_RUSLE_CONFIG)
+        self._data: Mapping[str, Any] = _freeze(base) if base is not None else _FROZEN_DEFAULT
         if overrides:
-            _merge_dict(self._data, overrides)
+            self._data = _merge_dict(self._data, overrides)
+        self._c_factor_lut: Optional[np.ndarray] = None
+        self._p_factor_table: Optional[Tuple[np.ndarray, np.ndarray]] = None
 
     @classmethod
     def from_dict(cls, data: Optional[Mapping[str, Any]]) -> "RUSLEConfig":
@@ -150,25 +304,76 @@ class RUSLEConfig:
 
     def merge_overrides(self, overrides: Optional[Mapping[str, Any]]) -> None:
         if overrides:
-            _merge_dict(self._data, overrides)
+            self._data = _merge_dict(self._data, overrides)
+            self._c_factor_lut = None
+            self._p_factor_table = None
 
     def get(self, path: str, default: Any = None) -> Any:
         """
         Retrieve a nested value via dotted path syntax. Returns ``default`` if
         any intermediate key is missing.
         """
-        parts = path.split(".")
-        current: Any = self._data
-        for part in parts:
-            if isinstance(current, Mapping) and part in current:
-                current = current[part]
-            else:
-                return default
-        return current
+        result = reduce(_step, _split_path(path), self._data)
+        return default if result is _MISSING else result
+
+    @property
+    def c_factor_lut(self) -> np.ndarray:
+        """
+        Dense float32 C-factor table indexed by integer land cover class.
+        Classes missing from ``c_factor.class_map`` hold the default value,
+        including the trailing slot one past the highest class.
+        """
+        if self._c_factor_lut is None:
+            class_map = self.get("c_factor.class_map") or {}
+            codes = np.fromiter((int(code) for code in class_map), dtype=np.int64, count=len(class_map))
+            values = np.fromiter((float(value) for value in class_map.values()), dtype=np.float32, count=len(class_map))
+            lut = np.full(int(codes.max(initial=-1)) + 2, self.get("c_factor.default_value", 0.0), dtype=np.float32)
+            lut[codes] = values
+            self._c_factor_lut = lut
+        return self._c_factor_lut
+
+    def lookup_c(self, class_codes: Any) -> np.ndarray:
+        """C-factor for integer class codes (scalar or array); unknown codes get the default."""
+        lut = self.c_factor_lut
+        codes = np.asarray(class_codes, dtype=np.int64)
+        return lut[np.where((codes >= 0) & (codes < lut.size), codes, -1)]
+
+    @property
+    def p_factor_table(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ``(thresholds, values)`` from the parsed ``p_factor.breakpoints``
+        (see ``prepare_p_factor_segments``). The final ``inf`` slot holds the
+        first open-ended value, or the default value when there is none.
+        """
+        if self._p_factor_table is None:
+            segments = prepare_p_factor_segments(self.get("p_factor.breakpoints"))
+            finite = [segment for segment in segments if segment["max"] is not None]
+            open_ended = [segment for segment in segments if segment["max"] is None]
+            fallback = open_ended[0]["value"] if open_ended else self.get("p_factor.default_value", 1.0)
+            self._p_factor_table = (
+                np.array([segment["max"] for segment in finite] + [np.inf]),
+                np.array([segment["value"] for segment in finite] + [float(fallback)]),
+            )
+        return self._p_factor_table
+
+    def lookup_p(self, slope: Any) -> Any:
+        """
+        P-factor for slope (scalar or array); a slope equal to a ``max_slope``
+        stays in that breakpoint's segment.
+        """
+        thresholds, values = self.p_factor_table
+        if np.ndim(slope) == 0:
+            return float(values[bisect.bisect_left(thresholds, float(slope))])
+        return values[np.searchsorted(thresholds, np.asarray(slope, dtype=np.float64), side="left")]
 
     def to_dict(self) -> Dict[str, Any]:
-        """Return a deep copy of the underlying data."""
-        return deepcopy(self._data)
+        """Return a deep, mutable copy of the underlying data."""
+        return _thaw(self._data)
+
+    def fingerprint(self) -> str:
+        """Return a stable hash of the merged configuration."""
+        encoded = json.dumps(self._data, sort_keys=True, separators=(",", ":"), default=_json_default)
+        return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
 
     def __getitem__(self, item: str) -> Any:
         return self._data[item]
@@ -0,0 +1,68 @@
+"""
+Bulk classification kernels for client-side RUSLE raster post-processing
+Uses Numba when it is installed and falls back to NumPy otherwise
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _classify_numpy(vals, edges, mins):
+    indices = np.searchsorted(edges, vals, side='right')
+    # Past the last edge: the last class when it is open-ended, else unclassified
+    indices[indices == edges.size] = edges.size - 1 if edges[-1] == np.inf else -1
+    # Below the min of the selected class (a gap between classes, or below the
+    # first class) is unclassified; NaN fails the comparison as well
+    indices[~(vals >= mins[indices])] = -1
+    return indices.astype(np.int32)
+
+
+if NUMBA_AVAILABLE:
+    # fastmath is left off: it assumes no NaNs, which would break the
+    # unclassified check below
+    @njit(parallel=True, cache=True)
+    def _classify_numba(vals, edges, mins):
+        out = np.empty(vals.size, dtype=np.int32)
+        last = edges.size - 1
+        overflow = last if edges[last] == np.inf else -1
+        for i in prange(vals.size):
+            value = vals[i]
+            lo = 0
+            hi = edges.size
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if value < edges[mid]:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            idx = lo if lo <= last else overflow
+            out[i] = idx if idx >= 0 and value >= mins[idx] else -1
+        return out
+
+
+def classify_erosion(vals, edges, mins):
+    """
+    Map soil loss values to erosion class indices.
+    Args:
+        vals: Array of soil loss values (any shape)
+        edges: Ascending class upper bounds; the last entry may be np.inf
+        mins: Class lower bounds, aligned with edges
+    Returns:
+        int32 array shaped like vals; index i means mins[i] <= v < edges[i],
+        values at or above a finite last edge, outside every class (including
+        gaps between classes), or NaN are -1 (matching the server-side
+        erosion class expression)
+    """
+    vals = np.asarray(vals, dtype=np.float64)
+    edges = np.asarray(edges, dtype=np.float64)
+    mins = np.asarray(mins, dtype=np.float64)
+    flat = np.ascontiguousarray(vals.ravel())
+    if NUMBA_AVAILABLE:
+        result = _classify_numba(flat, edges, mins)
+    else:
+        result = _classify_numpy(flat, edges, mins)
+    return result.reshape(vals.shape)
@@ -1,6 +1,7 @@
 """
 Celery background tasks for erosion map generation
 """
+from celery.signals import worker_process_shutdown
 from celery_app import celery_app
 from raster_generator import ErosionRasterGenerator
 from tile_generator import MapTileGenerator, DEFAULT_ZOOM_LEVELS
@@ -10,10 +11,60 @@ from rusle_config import build_config
 import logging
 import requests
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Best-effort callbacks are sent from here so GEE work is not held up by HTTP;
+# worker threads are only spawned on first submit, i.e. inside the child process
+_CALLBACK_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix='laravel-cb')
+
+# Created lazily so each forked worker process (and thread) gets its own pool
+_session_local = threading.local()
+
+
+def _get_session():
+    """
+    Keep-alive session for Laravel callbacks; retries only cover connection
+    failures, since POST is not in urllib3's idempotent methods
+    """
+    session = getattr(_session_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=8,
+            max_retries=Retry(total=2, backoff_factor=0.2),
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        _session_local.session = session
+    return session
+
+
+def _encode_payload(payload):
+    """
+    Serialize a callback payload to JSON bytes; orjson also handles the NumPy
+    scalars and arrays that can end up in statistics, and stringifies non-str
+    keys (e.g. year-keyed dicts) the way json does
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            payload,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        )
+    return json.dumps(payload).encode()
+
 
 def _post_to_laravel(path, payload, timeout=10):
     """
@@ -22,13 +73,13 @@ def _post_to_laravel(path, payload, timeout=10):
     base_url = Config.LARAVEL_BASE_URL.rstrip('/')
     url = urljoin(base_url + '/', path.lstrip('/'))
     
-    headers = {}
+    headers = {'Content-Type': 'application/json'}
     if Config.LARAVEL_HOST_HEADER:
         headers['Host'] = Config.LARAVEL_HOST_HEADER
     
-    response = requests.post(
+    response = _get_session().post(
         url,
-        json=payload,
+        data=_encode_payload(payload),
         timeout=timeout,
         headers=headers,
         verify=Config.LARAVEL_VERIFY_TLS
@@ -37,6 +88,27 @@ def _post_to_laravel(path, payload, timeout=10):
     return response
 
 
+def _post_async(path, payload, timeout=10):
+    """
+    Submit a callback to the background pool and return its Future
+    """
+    return _CALLBACK_POOL.submit(_post_to_laravel, path, payload, timeout)
+
+
+def _log_started_callback(future):
+    error = future.exception()
+    if error is None:
+        logger.info("Task started callback acknowledged by Laravel")
+    else:
+        logger.warning(f"Task started callback failed: {str(error)}")
+
+
+@worker_process_shutdown.connect
+def _drain_callback_pool(**kwargs):
+    """Flush pending callbacks before the worker process exits"""
+    _CALLBACK_POOL.shutdown(wait=True)
+
+
 @celery_app.task(bind=True, name='tasks.generate_erosion_map')
 def generate_erosion_map_task(
     self,
@@ -66,6 +138,7 @@ def generate_erosion_map_task(
     Returns:
         dict: Result with status, paths, and statistics
     """
+    started_callback = None
     try:
         end_year = end_year if end_year is not None else start_year
         period_label = str(start_year) if end_year == start_year else f"{start_year}-{end_year}"
@@ -75,61 +148,60 @@ def generate_erosion_map_task(
         logger.info(f"Task ID: {self.request.id}")
         tile_path_key = storage_key or f"{area_type}_{area_id}"
         
+        # Fields shared by every callback; never mutated once built, since the
+        # started callback is serialized on another thread
+        base_payload = {
+            'task_id': self.request.id,
+            'area_type': area_type,
+            'area_id': area_id,
+            'year': start_year,  # Legacy field for backward compatibility
+            'start_year': start_year,
+            'end_year': end_year,
+            'period_label': period_label,
+        }
+        if config_overrides:
+            base_payload['config_overrides'] = config_overrides
+        if user_id is not None:
+            base_payload['user_id'] = user_id
+        if defaults_version is not None:
+            base_payload['defaults_version'] = defaults_version
+        
         # Notify Laravel that task has started
         try:
-            callback_data = {
-                'task_id': self.request.id,
-                'area_type': area_type,
-                'area_id': area_id,
-                'year': start_year,  # Legacy field for backward compatibility
-                'start_year': start_year,
-                'end_year': end_year,
-                'period_label': period_label,
-            }
-            if config_overrides:
-                callback_data['config_overrides'] = config_overrides
-            if user_id is not None:
-                callback_data['user_id'] = user_id
-            if defaults_version is not None:
-                callback_data['defaults_version'] = defaults_version
+            callback_data = dict(base_payload)
             if geometry_hash is not None:
                 callback_data['geometry_hash'] = geometry_hash
             if tile_path_key:
                 callback_data['tile_path_key'] = tile_path_key
-            _post_to_laravel('/api/erosion/task-started', callback_data)
-            logger.info("Task started callback acknowledged by Laravel")
+            started_callback = _post_async('/api/erosion/task-started', callback_data)
+            started_callback.add_done_callback(_log_started_callback)
         except Exception as e:
             logger.warning(f"Task started callback failed: {str(e)}")
         
-        # Update status to processing
-        self.update_state(
-            state='PROCESSING',
-            meta={
-                'step': 'Initializing',
-                'progress': 0,
-                'area_type': area_type,
-                'area_id': area_id,
-                'start_year': start_year,
-                'end_year': end_year,
-                'period_label': period_label
-            }
-        )
+        # Progress updates are result-backend round trips, so only real steps
+        # report one; each carries the area fields for status consumers
+        progress_meta = {
+            'area_type': area_type,
+            'area_id': area_id,
+            'start_year': start_year,
+            'end_year': end_year,
+            'period_label': period_label,
+        }
+
+        def _emit(step, progress):
+            self.update_state(
+                state='PROCESSING',
+                meta={**progress_meta, 'step': step, 'progress': progress}
+            )
         
         # Step 1: Initialize GEE (if not already done)
-        self.update_state(
-            state='PROCESSING',
-            meta={'step': 'Initializing Google Earth Engine', 'progress': 5}
-        )
-        
         if not gee_service.is_initialized():
+            _emit('Initializing Google Earth Engine', 5)
             logger.info("Initializing GEE...")
             gee_service.initialize()
         
         # Step 2: Generate GeoTIFF raster
-        self.update_state(
-            state='PROCESSING',
-            meta={'step': 'Computing RUSLE raster', 'progress': 20}
-        )
+        _emit('Computing RUSLE raster', 20)
         
         logger.info("Starting raster generation...")
         rusle_config = build_config(config_overrides)
@@ -173,10 +245,7 @@ def generate_erosion_map_task(
         logger.info(f"  Statistics: {statistics}")
         
         # Step 3: Generate map tiles
-        self.update_state(
-            state='PROCESSING',
-            meta={'step': 'Generating map tiles', 'progress': 60}
-        )
+        _emit('Generating map tiles', 60)
         
         logger.info("Starting tile generation...")
         tile_gen = MapTileGenerator()
@@ -198,21 +267,12 @@ def generate_erosion_map_task(
         logger.info(f"✓ Tiles generated: {tiles_path}")
         
         # Step 4: Notify Laravel backend
-        self.update_state(
-            state='PROCESSING',
-            meta={'step': 'Updating database', 'progress': 90}
-        )
+        _emit('Updating database', 90)
         
         # Update Laravel database via callback (optional)
         try:
             callback_data = {
-                'task_id': self.request.id,
-                'area_type': area_type,
-                'area_id': area_id,
-                'year': start_year,  # Legacy field for backward compatibility
-                'start_year': start_year,
-                'end_year': end_year,
-                'period_label': period_label,
+                **base_payload,
                 'geotiff_path': geotiff_path,
                 'tiles_path': tiles_path,
                 'statistics': statistics,
@@ -220,18 +280,15 @@ def generate_erosion_map_task(
             }
             if tile_zoom_levels:
                 callback_data['max_zoom'] = max(tile_zoom_levels)
-            if config_overrides:
-                callback_data['config_overrides'] = config_overrides
-            if user_id is not None:
-                callback_data['user_id'] = user_id
-            if defaults_version is not None:
-                callback_data['defaults_version'] = defaults_version
             if geometry_hash is not None:
                 callback_data['geometry_hash'] = geometry_hash
             if tile_path_key:
                 callback_data['tile_path_key'] = tile_path_key
             if rusle_config.get("logging.include_config_snapshot", True):
                 callback_data['rusle_config'] = rusle_config.to_dict()
+            # Keep Laravel's view ordered: started must land before complete
+            if started_callback is not None:
+                wait([started_callback])
             _post_to_laravel('/api/erosion/task-complete', callback_data, timeout=30)
             logger.info("Task completion callback acknowledged by Laravel")
         except Exception as e:
@@ -274,25 +331,15 @@ def generate_erosion_map_task(
         # Notify Laravel that task failed
         try:
             callback_data = {
-                'task_id': self.request.id,
-                'area_type': area_type,
-                'area_id': area_id,
-                'year': start_year,
-                'start_year': start_year,
-                'end_year': end_year,
-                'period_label': period_label,
+                **base_payload,
                 'error': error_msg,
                 'error_type': error_type,
                 'metadata': metadata
             }
-            if config_overrides:
-                callback_data['config_overrides'] = config_overrides
-            if user_id is not None:
-                callback_data['user_id'] = user_id
-            if defaults_version is not None:
-                callback_data['defaults_version'] = defaults_version
             if rusle_config.get("logging.include_config_snapshot", True):
                 callback_data['rusle_config'] = rusle_config.to_dict()
+            if started_callback is not None:
+                wait([started_callback])
             _post_to_laravel('/api/erosion/task-failed', callback_data, timeout=30)
             logger.info("Task failed callback acknowledged by Laravel")
         except Exception as callback_error:
@@ -0,0 +1,88 @@
+import json
+import sys
+from pathlib import Path
+from types import ModuleType
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+if "ee" not in sys.modules:
+    sys.modules["ee"] = ModuleType("ee")
+
+if "dotenv" not in sys.modules:
+    dotenv_stub = ModuleType("dotenv")
+    dotenv_stub.load_dotenv = lambda *args, **kwargs: None
+    sys.modules["dotenv"] = dotenv_stub
+
+pytest.importorskip("flask")
+pytest.importorskip("flask_cors")
+
+import app as service_app
+
+
+def grid_cell(x, y, min_lon, min_lat, max_lon, max_lat, erosion_rate):
+    ring = [
+        [min_lon, min_lat],
+        [max_lon, min_lat],
+        [max_lon, max_lat],
+        [min_lon, max_lat],
+        [min_lon, min_lat],
+    ]
+    return {
+        "x": x,
+        "y": y,
+        "erosion_rate": erosion_rate,
+        "geometry": {"type": "Polygon", "coordinates": [ring]},
+    }
+
+
+@pytest.fixture
+def grid_client(monkeypatch):
+    result = {
+        "cells": [
+            grid_cell(0, 0, 68.0, 38.0, 68.1, 38.05, 1.25),
+            grid_cell(3, 7, 68.3, 38.35, 68.4, 38.4, 42.5),
+        ],
+        "statistics": {"mean": 21.88, "min": 1.25, "max": 42.5, "std_dev": 20.63},
+        "grid_size": 10,
+        "bbox": [68.0, 38.0, 69.0, 38.5],
+        "cell_count": 2,
+    }
+    monkeypatch.setattr(service_app.gee_service, "geometry_from_geojson", lambda geojson: object())
+    monkeypatch.setattr(
+        service_app.DEFAULT_RUSLE_CALCULATOR,
+        "compute_detailed_grid",
+        lambda *args, **kwargs: result,
+    )
+    return service_app.app.test_client()
+
+
+def test_binary_grid_round_trips_json_cells_and_headers(grid_client):
+    body = {
+        "area_geometry": {"type": "Polygon", "coordinates": []},
+        "year": service_app.Config.RUSLE_START_YEAR,
+        "grid_size": 10,
+    }
+
+    data = grid_client.post("/api/rusle/detailed-grid", json=body).get_json()["data"]
+    response = grid_client.post("/api/rusle/detailed-grid?format=bin", json=body)
+    records = np.frombuffer(response.data, dtype=service_app.GRID_CELL_DTYPE)
+
+    assert response.status_code == 200
+    assert response.headers["X-Record-Size"] == str(records.itemsize) == "28"
+    assert response.headers["X-Cell-Count"] == str(records.size) == str(len(data["cells"]))
+    assert response.headers["X-Grid-Size"] == str(data["grid_size"])
+    assert json.loads(response.headers["X-Grid-Bbox"]) == data["bbox"]
+    assert json.loads(response.headers["X-Grid-Statistics"]) == data["statistics"]
+    for record, cell in zip(records, data["cells"]):
+        ring = cell["geometry"]["coordinates"][0]
+        assert (record["x"], record["y"]) == (cell["x"], cell["y"])
+        np.testing.assert_allclose(
+            [record["min_lon"], record["min_lat"], record["max_lon"], record["max_lat"], record["erosion_rate"]],
+            [ring[0][0], ring[0][1], ring[2][0], ring[2][1], cell["erosion_rate"]],
+            rtol=1e-6,
+        )
@@ -0,0 +1,36 @@
+import sys
+from pathlib import Path
+from types import ModuleType
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+if "ee" not in sys.modules:
+    sys.modules["ee"] = ModuleType("ee")
+
+if "dotenv" not in sys.modules:
+    dotenv_stub = ModuleType("dotenv")
+    dotenv_stub.load_dotenv = lambda *args, **kwargs: None
+    sys.modules["dotenv"] = dotenv_stub
+
+from gee_service import gee_service
+
+
+def test_bbox_from_geojson_spans_all_polygon_parts():
+    multipolygon = {
+        "type": "MultiPolygon",
+        "coordinates": [
+            [[[68.0, 38.0], [69.0, 38.0], [69.0, 39.0], [68.0, 38.0]]],
+            [[[70.0, 37.5, 1200.0], [71.5, 37.5, 1200.0], [70.0, 38.5, 1200.0], [70.0, 37.5, 1200.0]]],
+        ],
+    }
+
+    assert gee_service.bbox_from_geojson(multipolygon) == {
+        "min_lon": 68.0,
+        "min_lat": 37.5,
+        "max_lon": 71.5,
+        "max_lat": 39.0,
+    }
+    assert gee_service.bbox_from_geojson({"type": "Polygon", "coordinates": []}) is None
+    assert gee_service.bbox_from_geojson({"type": "GeometryCollection", "geometries": []}) is None
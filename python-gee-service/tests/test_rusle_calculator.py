@@ -0,0 +1,297 @@
+import math
+import sys
+from collections import OrderedDict
+from pathlib import Path
+from types import ModuleType
+
+import numpy as np
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+if "ee" not in sys.modules:
+    sys.modules["ee"] = ModuleType("ee")
+
+if "requests" not in sys.modules:
+    sys.modules["requests"] = ModuleType("requests")
+
+if "dotenv" not in sys.modules:
+    dotenv_stub = ModuleType("dotenv")
+    dotenv_stub.load_dotenv = lambda *args, **kwargs: None
+    sys.modules["dotenv"] = dotenv_stub
+
+import rusle_calculator
+from rusle_calculator import RUSLECalculator, morton_order
+
+
+@pytest.fixture
+def calculator():
+    return RUSLECalculator()
+
+
+class FakeSampledCollection:
+    def __init__(self, requested):
+        self.requested = requested
+
+    def getDownloadURL(self, **kwargs):
+        self.requested.update(kwargs)
+        return "https://earthengine.test/table.csv"
+
+
+class FakeResponse:
+    def __init__(self, lines):
+        self.lines = lines
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self.lines)
+
+
+@pytest.fixture
+def csv_download(monkeypatch):
+    """Serve CSV lines from a fake Earth Engine table download."""
+    requested = {}
+    lines = []
+
+    def fake_get(url, stream=False, timeout=None):
+        requested["url"] = url
+        requested["stream"] = stream
+        return FakeResponse(lines)
+
+    monkeypatch.setattr(rusle_calculator.requests, "get", fake_get, raising=False)
+    return FakeSampledCollection(requested), requested, lines
+
+
+def test_morton_order_groups_cells_into_quadrants():
+    xs = [x for x in range(4) for _ in range(4)]
+    ys = [y for _ in range(4) for y in range(4)]
+
+    ordered = [(xs[i], ys[i]) for i in morton_order(xs, ys)]
+
+    assert ordered[:4] == [(0, 0), (1, 0), (0, 1), (1, 1)]
+    assert sorted(ordered) == sorted(zip(xs, ys))
+
+
+def test_spread_cells_keeps_the_limit_spread_over_every_quadrant():
+    grid_size = 16
+    cell_x = np.repeat(np.arange(grid_size), grid_size)
+    cell_y = np.tile(np.arange(grid_size), grid_size)
+
+    kept = RUSLECalculator._spread_cells(cell_x, cell_y, range(grid_size * grid_size), 16)
+    quadrants = [(cell_x[idx] >= 8, cell_y[idx] >= 8) for idx in kept]
+
+    assert len(set(kept)) == 16
+    assert sorted(quadrants.count(q) for q in set(quadrants)) == [4, 4, 4, 4]
+    assert RUSLECalculator._spread_cells(cell_x, cell_y, [17, 0, 1], 16) == [0, 1, 17]
+
+
+def test_cached_builds_once_and_evicts_least_recently_used(calculator):
+    calculator.GRAPH_CACHE_SIZE = 2
+    cache = OrderedDict()
+    builds = []
+
+    def build(key):
+        builds.append(key)
+        return f"image-{key}"
+
+    assert calculator._cached(cache, "a", lambda: build("a")) == "image-a"
+    assert calculator._cached(cache, "a", lambda: build("a")) == "image-a"
+    calculator._cached(cache, "b", lambda: build("b"))
+    calculator._cached(cache, "a", lambda: build("a"))
+    calculator._cached(cache, "c", lambda: build("c"))
+
+    assert builds == ["a", "b", "c"]
+    assert list(cache) == ["a", "c"]
+
+
+def test_trend_and_cv_interpretation_match_rule_boundaries(calculator):
+    assert calculator._interpret_trend(2.0) == "Significant increasing trend"
+    assert calculator._interpret_trend(0.0) == "Stable/No significant trend"
+    assert calculator._interpret_trend(-0.5) == "Stable/No significant trend"
+    assert calculator._interpret_trend(-5.0) == "Significant decreasing trend"
+    assert calculator._interpret_cv(9.99) == "Very low variability"
+    assert calculator._interpret_cv(10.0) == "Low variability"
+    assert calculator._interpret_cv(400.0) == "Very high variability"
+    assert list(calculator._interpret_trend_batch([3.0, -3.0])) == [
+        "Significant increasing trend",
+        "Significant decreasing trend",
+    ]
+
+
+def test_p_slope_classes_bin_by_exceeded_breakpoints(calculator):
+    assert calculator.p_slope_class_expression == (
+        "(s > 5.0) + (s > 10.0) + (s > 20.0) + (s > 30.0) + (s > 50.0) + (s > 100.0)"
+    )
+    assert calculator.p_slope_class_values == [0.10, 0.12, 0.14, 0.19, 0.25, 0.33, 0.33]
+
+
+def test_classify_array_uses_half_open_erosion_classes(calculator):
+    values = np.array([[0.0, 4.99, 5.0], [49.9, 50.0, 500.0], [-1.0, np.nan, 15.0]])
+
+    assert calculator.classify_array(values).tolist() == [[0, 0, 1], [3, 4, 4], [-1, -1, 2]]
+
+    bounded = RUSLECalculator({
+        "erosion_classes": [
+            {"key": "low", "label": "Low", "min": 0, "max": 10},
+            {"key": "high", "label": "High", "min": 10, "max": 20},
+        ],
+    })
+
+    assert bounded.classify_array(np.array([0.0, 9.9, 10.0, 19.9, 20.0, 25.0])).tolist() == [0, 0, 1, 1, -1, -1]
+
+
+def test_classify_array_leaves_gaps_between_classes_unclassified():
+    gapped = RUSLECalculator({
+        "erosion_classes": [
+            {"key": "low", "label": "Low", "min": 0, "max": 10},
+            {"key": "high", "label": "High", "min": 20, "max": None},
+        ],
+    })
+
+    values = np.array([5.0, 10.0, 15.0, 19.9, 20.0, 100.0])
+    assert gapped.classify_array(values).tolist() == [0, -1, -1, -1, 1, 1]
+
+
+def test_p_factor_array_matches_slope_class_binning(calculator):
+    slopes = np.array([0.0, 5.0, 5.1, 100.0, 150.0])
+    cropland = np.array([True, True, True, True, False])
+
+    np.testing.assert_allclose(
+        calculator.p_factor_array(slopes, cropland),
+        [0.10, 0.10, 0.12, 0.33, 1.0],
+        rtol=1e-6,
+    )
+
+
+def test_k_and_ls_expressions_inline_config_constants(calculator):
+    clay, sand, soc = 30.0, 40.0, 2.0
+    fine_sand = sand * 0.2
+    silt = 100 - fine_sand - clay
+    expected_k = 27.66 * (silt + fine_sand * (100 - clay)) ** 1.14 * 1e-8 * (12.0 - soc * 0.01724)
+
+    k_value = eval(calculator.k_factor_expression, {"pow": pow}, {"clay": clay, "sand": sand, "soc": soc, "adj": 0.0})
+    ls_env = {"pow": pow, "sin": math.sin}
+    ls_value = eval(calculator.ls_factor_expression, ls_env, {"flow_acc": 10.0, "cell": 1000.0, "slope": 30.0})
+    ls_flat = eval(calculator.ls_factor_expression, ls_env, {"flow_acc": 0.0, "cell": 1000.0, "slope": 0.0})
+
+    assert "e-" not in calculator.k_factor_expression
+    assert math.isclose(k_value, expected_k)
+    assert math.isclose(ls_value, (10.0 * 1000.0 / 22.13) ** 0.4 * (0.5 / 0.0896) ** 1.3)
+    assert math.isclose(ls_flat, (1000.0 / 22.13) ** 0.4 * (math.sin(0.0001) / 0.0896) ** 1.3)
+
+
+def test_soil_loss_expression_multiplies_factors_and_clamps(calculator):
+    factors = {"R": 400.0, "K": 0.03, "LS": 2.0, "C": 0.1, "P": 1.0}
+
+    assert math.isclose(eval(calculator.soil_loss_expression, {}, factors), 2.4)
+    assert eval(calculator.soil_loss_expression, {}, dict(factors, R=1e6)) == 200.0
+    assert eval(calculator.soil_loss_expression, {}, dict(factors, K=-0.1)) == 0.0
+
+
+def test_p_factor_segments_sort_breakpoints_and_skip_invalid_entries():
+    calculator = RUSLECalculator({
+        "p_factor": {
+            "breakpoints": [
+                {"max_slope": 20, "value": 0.3},
+                {"max_slope": None, "value": 0.5},
+                {"max_slope": "bad", "value": 0.9},
+                {"max_slope": 8, "value": "0.2"},
+                {"max_slope": 12, "value": None},
+            ],
+        },
+    })
+
+    assert calculator.p_factor_segments == [
+        {"min": None, "max": 8.0, "value": 0.2},
+        {"min": 8.0, "max": 20.0, "value": 0.3},
+        {"min": 20.0, "max": None, "value": 0.5},
+    ]
+
+
+def test_erosion_class_expression_assigns_half_open_ranges():
+    calculator = RUSLECalculator({
+        "erosion_classes": [
+            {"key": "low", "label": "Low", "min": 0, "max": 10},
+            {"key": "high", "label": "High", "min": 10, "max": None},
+        ],
+    })
+
+    assert calculator.erosion_class_expression == (
+        "(b >= 0 && b < 10) ? 0 : (b >= 10) ? 1 : -1"
+    )
+
+
+def test_coarsen_for_sampling_keeps_image_when_cells_fit_in_one_sample_pixel(calculator):
+    image = object()
+    bbox = {"min_lon": 68.0, "min_lat": 38.0, "max_lon": 68.01, "max_lat": 38.01}
+
+    assert calculator._coarsen_for_sampling(image, bbox, 0.0005, 0.0005, 100) is image
+
+
+def test_coarsen_grid_is_aligned_to_cells_and_bounds_reduce_inputs(calculator):
+    bbox = {"min_lon": 68.0, "min_lat": 38.0, "max_lon": 69.0, "max_lat": 38.5}
+    cell_width, cell_height = 0.1, 0.05
+
+    transform = calculator._cell_grid_transform(bbox, cell_width, cell_height)
+    assert transform == [0.1, 0, 68.0, 0, 0.05, 38.0]
+    # Pixel edges of the reduction grid coincide with the emitted cell edges
+    pixels = np.arange(11)
+    np.testing.assert_allclose(transform[2] + pixels * transform[0], np.linspace(68.0, 69.0, 11))
+    np.testing.assert_allclose(transform[5] + pixels * transform[4], np.linspace(38.0, 38.5, 11))
+    assert calculator._coarsen_input_scale(0.01, 0.01, 100) == 100
+
+    pixel = calculator._coarsen_input_scale(cell_width, cell_height, 100) / calculator.METERS_PER_DEGREE
+    inputs_per_cell = (cell_width / pixel + 1) * (cell_height / pixel + 1)
+    assert pixel > 100 / calculator.METERS_PER_DEGREE
+    assert inputs_per_cell <= calculator.MAX_REDUCE_PIXELS
+
+
+def test_cells_in_region_prefilter_tests_bboxes_or_centres():
+    pytest.importorskip("shapely")
+    edges = np.array([0.0, 1.0, 2.0])
+    cell_x = np.repeat(np.arange(2), 2)
+    cell_y = np.tile(np.arange(2), 2)
+    bounds = (edges[cell_x], edges[cell_y], edges[cell_x + 1], edges[cell_y + 1])
+    strip = {"type": "Polygon", "coordinates": [[[0, 0], [0.4, 0], [0.4, 2], [0, 2], [0, 0]]]}
+
+    assert RUSLECalculator._cells_intersecting_region(bounds, strip) == [0, 1]
+    assert RUSLECalculator._cells_intersecting_region(bounds, strip, by_center=True) == []
+    assert RUSLECalculator._cells_intersecting_region(bounds, None) is None
+
+
+def test_parse_sample_rows_accepts_feature_properties_and_csv_records():
+    cell_idx, soil_loss = RUSLECalculator._parse_sample_rows([
+        {"cell_idx": 3, "soil_loss": 12.5},
+        {"cell_idx": None, "soil_loss": 1.0},
+        {"cell_idx": "7", "soil_loss": "0.25"},
+        {"cell_idx": "9", "soil_loss": ""},
+    ])
+
+    assert cell_idx.tolist() == [3, 7, 9]
+    assert soil_loss.tolist() == [12.5, 0.25, 0.0]
+
+
+def test_download_sample_rows_streams_csv_columns(calculator, csv_download):
+    collection, requested, lines = csv_download
+    lines.extend(["cell_idx,soil_loss", "4,1.5", "11,", ",3.0"])
+
+    cell_idx, soil_loss = calculator._download_sample_rows(collection)
+
+    assert requested == {
+        "filetype": "CSV",
+        "selectors": ["cell_idx", "soil_loss"],
+        "url": "https://earthengine.test/table.csv",
+        "stream": True,
+    }
+    assert cell_idx.tolist() == [4, 11]
+    assert soil_loss.tolist() == [1.5, 0.0]
@@ -3,6 +3,9 @@ import sys
 from pathlib import Path
 from types import ModuleType
 
+import numpy as np
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
@@ -10,6 +13,9 @@ if str(PROJECT_ROOT) not in sys.path:
 if "ee" not in sys.modules:
     sys.modules["ee"] = ModuleType("ee")
 
+if "requests" not in sys.modules:
+    sys.modules["requests"] = ModuleType("requests")
+
 if "dotenv" not in sys.modules:
     dotenv_stub = ModuleType("dotenv")
     dotenv_stub.load_dotenv = lambda *args, **kwargs: None
@@ -59,8 +65,8 @@ def test_rusle_calculator_parameters_reflect_overrides():
 
     calculator = RUSLECalculator(overrides)
 
-    assert math.isclose(calculator.k_factor_params["sand_fraction_multiplier"], 0.15)
-    assert math.isclose(calculator.k_factor_params["soc_to_organic_multiplier"], 0.02)
+    assert math.isclose(calculator.k_factor_params.sand_fraction_multiplier, 0.15)
+    assert math.isclose(calculator.k_factor_params.soc_to_organic_multiplier, 0.02)
     assert math.isclose(calculator.p_factor_segments[-1]["value"], 0.4)
     assert [cls["key"] for cls in calculator.erosion_classes] == ["low", "high"]
     assert not calculator.include_config_snapshot
@@ -74,3 +80,67 @@ def test_config_snapshot_returns_merged_data():
     assert math.isclose(snapshot["r_factor"]["coefficient"], 0.7)
     assert math.isclose(snapshot["k_factor"]["sand_fraction_multiplier"], 0.2)
 
+
+
+def test_config_fingerprint_is_stable_and_reflects_overrides():
+    assert build_config().fingerprint() == build_config().fingerprint()
+    assert build_config().fingerprint() != build_config({"r_factor": {"coefficient": 0.7}}).fingerprint()
+
+
+def test_config_data_is_read_only_and_to_dict_returns_mutable_copy():
+    config = build_config({"erosion_classes": [{"key": "all", "label": "All", "min": 0, "max": None}]})
+    snapshot = config.to_dict()
+    snapshot["k_factor"]["base_constant"] = 1.0
+    snapshot["erosion_classes"].append({"key": "extra"})
+
+    assert math.isclose(config.get("k_factor.base_constant"), 27.66)
+    assert math.isclose(build_config().get("k_factor.base_constant"), 27.66)
+    assert [cls["key"] for cls in config.get("erosion_classes")] == ["all"]
+    with pytest.raises(TypeError):
+        config.get("k_factor")["base_constant"] = 1.0
+
+
+def test_c_factor_lookup_uses_dense_table_and_tracks_overrides():
+    config = build_config()
+
+    assert config.c_factor_lut.dtype == np.float32
+    np.testing.assert_allclose(config.lookup_c([12, 16, 17, 0, 99, -3]), [0.15, 0.4, 0.0, 0.0, 0.0, 0.0])
+
+    config.merge_overrides({"c_factor": {"default_value": 0.5, "class_map": {"12": 0.2}}})
+
+    np.testing.assert_allclose(config.lookup_c([12, 16, 99]), [0.2, 0.4, 0.5])
+
+
+def test_p_factor_lookup_bins_scalars_and_arrays_alike():
+    config = build_config()
+
+    assert config.lookup_p(5.0) == 0.10
+    assert config.lookup_p(5.1) == 0.12
+    np.testing.assert_allclose(config.lookup_p([0.0, 20.0, 100.0, 150.0]), [0.10, 0.14, 0.33, 0.33])
+
+    config.merge_overrides({"p_factor": {"default_value": 0.9, "breakpoints": [{"max_slope": 10, "value": 0.4}]}})
+
+    np.testing.assert_allclose(config.lookup_p(np.array([3.0, 12.0])), [0.4, 0.9])
+
+
+def test_p_factor_lookup_skips_invalid_breakpoints_like_the_calculator():
+    overrides = {
+        "p_factor": {
+            "default_value": 0.9,
+            "breakpoints": [
+                {"max_slope": 20, "value": 0.3},
+                {"max_slope": "bad", "value": 0.7},
+                {"max_slope": 8, "value": "0.2"},
+                {"max_slope": 12, "value": None},
+            ],
+        },
+    }
+    config = build_config(overrides)
+    slopes = np.array([0.0, 8.0, 12.0, 20.0, 45.0])
+
+    np.testing.assert_allclose(config.lookup_p(slopes), [0.2, 0.2, 0.3, 0.3, 0.9])
+    np.testing.assert_allclose(
+        config.lookup_p(slopes),
+        RUSLECalculator(config).p_factor_array(slopes, np.ones(slopes.size, dtype=bool)),
+        rtol=1e-6,
+    )